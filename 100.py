@@ -1,40 +1,218 @@
+import argparse
+import hashlib
 import json 
 import os 
 from datetime import datetime, timedelta, timezone 
+from itertools import repeat
+import metrics
+from json_files import read_json, write_json
+from nepali_calendar import DateTable, read_calendar_months
 
 # --- CONFIGURATION ---
 DOMAIN = "https://today.singhyogendra.com.np"
 SUB_FOLDER = "nepali-date"  # Folder where date files will reside
-JSON_FILE = "date/2026.json"
+JSON_FILES = ["date/2026.json"]  # Default calendar; pass more files on the command line to merge years
+CALENDAR_INDEX_FILE = f"{SUB_FOLDER}/calendar.json"  # Compact day/event index the pages use to track "today"
+ASSET_FOLDER = "assets"  # Versioned shared CSS/JS written by --split-assets
+MANIFEST_FILE = ".build/site_manifest.json"  # Content hashes of the last written pages
+CONTENT_FILE = ".build/site_content.json"  # Date-independent hash per page, for generate_sitemap.py's lastmod
 LOCAL_OFFSET = timezone(timedelta(hours=5, minutes=45))
 
-# Logic to fetch current Nepal Time
-NOW = datetime.now(LOCAL_OFFSET)
-TODAY_AD_STR = NOW.strftime('%Y-%m-%d')
+# Current Nepal date, pinned by set_today() when a build starts
+TODAY_AD_STR = None
+TODAY_ORDINAL = None
 
-# Ensure the subfolder exists before writing files
-if not os.path.exists(SUB_FOLDER):
-    os.makedirs(SUB_FOLDER)
+# --- SHARED PAGE CHROME ---
+# Identical on every page: inlined by default, or written once to ASSET_FOLDER by --split-assets
+SITE_CSS = """        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;700;900&display=swap');
+        body { font-family: 'Inter', sans-serif; scroll-behavior: smooth; }
+        #goto-today-btn {
+            position: fixed; bottom: 2rem; right: 1.5rem; z-index: 100;
+            display: none; animation: floatBounce 2s infinite;
+        }
+        @keyframes floatBounce {
+            0%, 100% { transform: translateY(0); }
+            50% { transform: translateY(-10px); }
+        }"""
 
-def get_html_template(target_day, full_year_days, month_label, ad_month):
+CLOCK_JS = """        function updateClocks() {
+            const now = new Date();
+            // Local Clock
+            document.getElementById('local-clock').innerText = now.toLocaleTimeString();
+            
+            // Fixed Nepal Clock & Date logic
+            const nptFormatter = new Intl.DateTimeFormat('en-CA', {
+                timeZone: 'Asia/Kathmandu',
+                year: 'numeric',
+                month: '2-digit',
+                day: '2-digit',
+                hour: '2-digit',
+                minute: '2-digit',
+                second: '2-digit',
+                hour12: false
+            });
+            
+            const nptParts = nptFormatter.formatToParts(now);
+            const nptDateMap = {};
+            nptParts.forEach(p => nptDateMap[p.type] = p.value);
+            
+            const nptDateStr = `${nptDateMap.year}-${nptDateMap.month}-${nptDateMap.day}`;
+            document.getElementById('npt-clock').innerText = `${nptDateMap.hour}:${nptDateMap.minute}:${nptDateMap.second}`;
+
+            const renderedDate = document.body.dataset.ad;
+            
+            // Only show the button if the current Nepal date is truly different from the page date
+            if (nptDateStr !== renderedDate) {
+                document.getElementById('goto-today-btn').style.display = 'flex';
+            } else {
+                document.getElementById('goto-today-btn').style.display = 'none';
+            }
+        }
+        setInterval(updateClocks, 1000); 
+        updateClocks();"""
+
+LIVE_JS = """        // Pages are rebuilt once a day at most. If the Nepal date has moved on since this page was built,
+        // recompute today's highlight and the event countdowns (and on index.html the whole header) from the calendar index.
+        const dayMs = 86400000;
+        const toDayNumber = s => Date.UTC(+s.slice(0, 4), +s.slice(5, 7) - 1, +s.slice(8, 10)) / dayMs;
+        const esc = s => String(s).replace(/[&<>"']/g, c => `&#${c.charCodeAt(0)};`);
+
+        function nepalToday() {
+            const parts = {};
+            new Intl.DateTimeFormat('en-CA', { timeZone: 'Asia/Kathmandu', year: 'numeric', month: '2-digit', day: '2-digit' })
+                .formatToParts(new Date()).forEach(p => parts[p.type] = p.value);
+            return `${parts.year}-${parts.month}-${parts.day}`;
+        }
+
+        function renderHeader(today) {
+            document.getElementById('dynamic-bs').innerText = today.bs;
+            document.getElementById('dynamic-ad').innerText = today.ad;
+            document.getElementById('dynamic-day').innerText = today.day;
+            document.getElementById('dynamic-event-container').innerHTML = today.event
+                ? `<div class="p-6 bg-yellow-50 text-center text-yellow-800 font-bold text-lg sm:text-xl border-b border-yellow-100">✨ ${esc(today.event)}</div>`
+                : '';
+            document.body.dataset.ad = today.ad;
+        }
+
+        function renderGrid(grid, month, base) {
+            // Rebuild the cells from an existing one when today falls in a different month than the built page
+            const template = grid.querySelector('a');
+            document.getElementById('month-label').innerText = month.label;
+            grid.replaceChildren(...month.days.map(([ad, bs, day, event]) => {
+                const cell = template.cloneNode(true);
+                const [weekday, date] = cell.querySelectorAll('div');
+                cell.href = `${base}${bs}.html`;
+                weekday.innerText = day.slice(0, 3);
+                date.innerText = bs.split('-')[2];
+                cell.querySelectorAll('span').forEach(dot => dot.remove());
+                if (event) {
+                    const dot = document.createElement('span');
+                    dot.className = 'block w-1 h-1 bg-red-500 rounded-full mx-auto mt-1';
+                    cell.appendChild(dot);
+                }
+                return cell;
+            }));
+        }
+
+        function highlightGrid(grid, bs) {
+            const normal = grid.dataset.normal.split(' ');
+            const highlight = grid.dataset.highlight.split(' ');
+            grid.querySelectorAll('a').forEach(cell => {
+                const isToday = cell.getAttribute('href').endsWith(`/${bs}.html`);
+                cell.classList.remove(...(isToday ? normal : highlight));
+                cell.classList.add(...(isToday ? highlight : normal));
+            });
+        }
+
+        function renderEvents(days, todayAd, base) {
+            const todayNumber = toDayNumber(todayAd);
+            const upcoming = days.filter(d => d.event && d.ad >= todayAd).slice(0, 10);
+            document.getElementById('events-list').innerHTML = upcoming.length ? upcoming.map(e => {
+                const daysLeft = toDayNumber(e.ad) - todayNumber;
+                return `
+                <a href="${base}${e.bs}.html" class="bg-white p-4 rounded-2xl border border-slate-100 flex flex-wrap justify-between items-center shadow-sm hover:border-red-300 transition-colors">
+                    <div class="flex flex-col">
+                        <span class="font-bold text-slate-800">${esc(e.event)}</span>
+                        <span class="text-xs text-slate-400 font-medium">${e.bs} (${e.ad})</span>
+                    </div>
+                    <div class="bg-red-50 text-red-600 px-3 py-1 rounded-full text-xs font-black mt-2 sm:mt-0">
+                        ${daysLeft === 0 ? 'Today' : `In ${daysLeft} Days`}
+                    </div>
+                </a>`;
+            }).join('') : '<p class="text-slate-400 p-4 italic">No more festivals remaining this year.</p>';
+        }
+
+        async function refreshToday() {
+            const body = document.body;
+            const todayAd = nepalToday();
+            if (todayAd === body.dataset.built) return;
+
+            const index = await (await fetch(body.dataset.calendar)).json();
+            const days = index.months.flatMap(m => m.days.map(([ad, bs, day, event]) => ({ ad, bs, day, event })));
+            const today = days.find(d => d.ad === todayAd);
+            const grid = document.getElementById('month-grid');
+
+            if (today && body.dataset.live) {
+                renderHeader(today);
+                const month = index.months.find(m => m.days.some(d => d[0] === todayAd));
+                if (!grid.querySelector(`a[href$="/${today.bs}.html"]`)) renderGrid(grid, month, index.base);
+            }
+            highlightGrid(grid, today ? today.bs : '');
+            renderEvents(days, todayAd, index.base);
+        }
+        refreshToday().catch(() => {});"""
+
+FOOTER_HTML = """    <footer class="text-center py-10 border-t border-slate-200 text-slate-400 text-[10px] sm:text-xs">
+        <p class="font-bold text-slate-500 mb-2 uppercase tracking-widest">Nepali date today | Today Nepali date | Nepali Patro</p>
+        <p>© 2026 Today Singh Yogendra. All Rights Reserved.</p>
+    </footer>"""
+
+COUNTER_STYLE = "position:fixed;top:0;left:0;width:100%;height:1px;overflow:hidden;visibility:hidden;z-index:9999;"
+COUNTER_HTML = """    <script type="text/javascript" src="//widget.supercounters.com/ssl/online_i.js"></script>
+    <script type="text/javascript">sc_online_i(1727928,"ffffff","ffffff");</script>
+    <noscript><a href="https://www.supercounters.com/" style="visibility:hidden;">free online counter</a></noscript>"""
+
+GRID_CELL_CLASS = "hover:bg-gray-50"
+GRID_HIGHLIGHT_CLASS = "ring-4 ring-red-500 shadow-lg bg-red-50"
+
+def build_month_grid(month_days):
+    """Renders a month's calendar cells once, with no day highlighted.
+
+    Returns (html, slots) where slots maps each AD date to the (start, end) offsets of that
+    cell's state class, so highlight_grid() can mark a day without re-rendering the month.
+    """
+    parts, slots, pos = [], {}, 0
+    for day in month_days:
+        event_dot = '<span class="block w-1 h-1 bg-red-500 rounded-full mx-auto mt-1"></span>' if day.get('event') else ''
+        # UPDATED: Links now point inside the /nepali-date/ folder
+        before = f'''
+        <a href="{DOMAIN}/{SUB_FOLDER}/{day['bs']}.html" class="p-2 sm:p-4 border border-gray-100 rounded-xl text-center '''
+        after = f''' transition-all block">
+            <div class="text-[10px] text-gray-400 font-bold uppercase">{day['day'][:3]}</div>
+            <div class="text-lg sm:text-xl font-bold text-slate-800">{day['bs'].split("-")[-1]}</div>
+            {event_dot}
+        </a>'''
+        start = pos + len(before)
+        slots[day['ad']] = (start, start + len(GRID_CELL_CLASS))
+        parts.append(before + GRID_CELL_CLASS + after)
+        pos += len(parts[-1])
+    return "".join(parts), slots
+
+def highlight_grid(grid, ad):
+    """Splices the highlight class into the cell for `ad`; returns the grid unchanged if it is not in this month."""
+    html, slots = grid
+    if ad not in slots:
+        return html
+    start, end = slots[ad]
+    return html[:start] + GRID_HIGHLIGHT_CLASS + html[end:]
+
+def get_html_template(target_day, date_table, month_label, ad_month, calendar_html, assets=None, live=False):
     # Calculations for "Days Left" and Event Navigation
-    # FIX: We now use full_year_days so past/future pages always show global upcoming events
-    today_dt = datetime.strptime(TODAY_AD_STR, '%Y-%m-%d')
-    upcoming_events = []
-    for d in full_year_days:
-        if d.get('event'):
-            event_dt = datetime.strptime(d['ad'], '%Y-%m-%d')
-            days_left = (event_dt - today_dt).days
-            if days_left >= 0:
-                upcoming_events.append({
-                    "event": d['event'],
-                    "bs": d['bs'],
-                    "ad": d['ad'],
-                    "days_left": days_left
-                })
+    # The table covers the whole calendar so past/future pages always show global upcoming events
+    upcoming_events = date_table.upcoming_events(TODAY_ORDINAL)
     
-    # Sort and pick top 10 for the UI
-    ui_upcoming_events = sorted(upcoming_events, key=lambda x: x['days_left'])[:10]
+    # Already sorted by date, pick top 10 for the UI
+    ui_upcoming_events = upcoming_events[:10]
 
     # --- DYNAMIC FAQ GENERATION ---
     faqs = [
@@ -64,21 +242,28 @@ def get_html_template(target_day, full_year_days, month_label, ad_month):
         "mainEntity": [{"@type": "Question", "name": f["q"], "acceptedAnswer": {"@type": "Answer", "text": f["a"]}} for f in faqs]
     }
 
-    # Month View Grid (This remains month-specific for the UI)
-    # We filter the full_year_days to only show days belonging to this specific month_label
-    # (Using the global target_day_context_days defined in build_site)
-    
-    calendar_html = ""
-    for day in target_day_context_days:
-        is_viewing = "ring-4 ring-red-500 shadow-lg bg-red-50" if day['ad'] == TODAY_AD_STR else "hover:bg-gray-50"
-        event_dot = '<span class="block w-1 h-1 bg-red-500 rounded-full mx-auto mt-1"></span>' if day.get('event') else ''
-        # UPDATED: Links now point inside the /nepali-date/ folder
-        calendar_html += f'''
-        <a href="{DOMAIN}/{SUB_FOLDER}/{day['bs']}.html" class="p-2 sm:p-4 border border-gray-100 rounded-xl text-center {is_viewing} transition-all block">
-            <div class="text-[10px] text-gray-400 font-bold uppercase">{day['day'][:3]}</div>
-            <div class="text-lg sm:text-xl font-bold text-slate-800">{day['bs'].split("-")[-1]}</div>
-            {event_dot}
-        </a>'''
+    # Shared chrome: inline, or links to the versioned files from write_shared_assets()
+    if assets:
+        head_assets = f'<link rel="stylesheet" href="{assets["css"]}">'
+        body_assets = f'''    <script src="{assets['js']}" defer></script>
+
+<div style="{COUNTER_STYLE}">
+    <iframe src="{assets['counter']}" title="Online counter" width="1" height="1"></iframe>
+</div>'''
+    else:
+        head_assets = f"<style>\n{SITE_CSS}\n    </style>"
+        body_assets = f"""{FOOTER_HTML}
+
+    <script>
+{CLOCK_JS}
+
+{LIVE_JS}
+    </script>
+
+<!-- Supercounters (optional) -->
+<div style="{COUNTER_STYLE}">
+{COUNTER_HTML}
+</div>"""
 
     return f"""<!DOCTYPE html>
 <html lang="ne">
@@ -93,20 +278,9 @@ def get_html_template(target_day, full_year_days, month_label, ad_month):
     <link rel="icon" type="image/png" href="/favicon.ico">
     <script type="application/ld+json">{json.dumps(faq_json_ld)}</script>
     <script src="https://cdn.tailwindcss.com"></script>
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;700;900&display=swap');
-        body {{ font-family: 'Inter', sans-serif; scroll-behavior: smooth; }}
-        #goto-today-btn {{
-            position: fixed; bottom: 2rem; right: 1.5rem; z-index: 100;
-            display: none; animation: floatBounce 2s infinite;
-        }}
-        @keyframes floatBounce {{
-            0%, 100% {{ transform: translateY(0); }}
-            50% {{ transform: translateY(-10px); }}
-        }}
-    </style>
+    {head_assets}
 </head>
-<body class="bg-slate-50 text-slate-900 antialiased">
+<body class="bg-slate-50 text-slate-900 antialiased" data-ad="{target_day['ad']}" data-built="{TODAY_AD_STR}" data-calendar="/{CALENDAR_INDEX_FILE}"{' data-live="true"' if live else ''}>
     <a id="goto-today-btn" href="{DOMAIN}" class="bg-red-600 text-white px-6 py-4 rounded-full font-black shadow-2xl flex items-center gap-2 hover:bg-red-700 transition-all">
         <span>📅</span> <span>GO TO TODAY</span>
     </a>
@@ -143,8 +317,8 @@ def get_html_template(target_day, full_year_days, month_label, ad_month):
         </div>
 
         <section class="bg-white p-4 sm:p-8 rounded-[2rem] shadow-sm border border-slate-100 mb-8">
-            <h3 class="text-xl font-black text-slate-800 mb-6 uppercase text-center sm:text-left px-2 tracking-tight">{month_label}</h3>
-            <div class="grid grid-cols-7 gap-1 sm:gap-3">{calendar_html}</div>
+            <h3 class="text-xl font-black text-slate-800 mb-6 uppercase text-center sm:text-left px-2 tracking-tight" id="month-label">{month_label}</h3>
+            <div class="grid grid-cols-7 gap-1 sm:gap-3" id="month-grid" data-normal="{GRID_CELL_CLASS}" data-highlight="{GRID_HIGHLIGHT_CLASS}">{calendar_html}</div>
         </section>
 
         <section class="mb-8" id="upcoming-events-section">
@@ -173,97 +347,225 @@ def get_html_template(target_day, full_year_days, month_label, ad_month):
         </section>
     </main>
 
-    <footer class="text-center py-10 border-t border-slate-200 text-slate-400 text-[10px] sm:text-xs">
-        <p class="font-bold text-slate-500 mb-2 uppercase tracking-widest">Nepali date today | Today Nepali date | Nepali Patro</p>
-        <p>© 2026 Today Singh Yogendra. All Rights Reserved.</p>
-    </footer>
+{body_assets}
 
-    <script>
-        function updateClocks() {{
-            const now = new Date();
-            // Local Clock
-            document.getElementById('local-clock').innerText = now.toLocaleTimeString();
-            
-            // Fixed Nepal Clock & Date logic
-            const nptFormatter = new Intl.DateTimeFormat('en-CA', {{
-                timeZone: 'Asia/Kathmandu',
-                year: 'numeric',
-                month: '2-digit',
-                day: '2-digit',
-                hour: '2-digit',
-                minute: '2-digit',
-                second: '2-digit',
-                hour12: false
-            }});
-            
-            const nptParts = nptFormatter.formatToParts(now);
-            const nptDateMap = {{}};
-            nptParts.forEach(p => nptDateMap[p.type] = p.value);
-            
-            const nptDateStr = `${{nptDateMap.year}}-${{nptDateMap.month}}-${{nptDateMap.day}}`;
-            document.getElementById('npt-clock').innerText = `${{nptDateMap.hour}}:${{nptDateMap.minute}}:${{nptDateMap.second}}`;
+</body>
+</html>"""
 
-            const renderedDate = "{target_day['ad']}";
-            
-            // Only show the button if the current Nepal date is truly different from the page date
-            if (nptDateStr !== renderedDate) {{
-                document.getElementById('goto-today-btn').style.display = 'flex';
-            }} else {{
-                document.getElementById('goto-today-btn').style.display = 'none';
-            }}
-        }}
-        setInterval(updateClocks, 1000); 
-        updateClocks();
-    </script>
+def write_page(path, html, manifest, stats, force=False):
+    """Writes html to path unless the manifest shows identical content is already there."""
+    path = path.replace(os.sep, "/")
+    digest = hashlib.sha256(html.encode('utf-8')).hexdigest()
+    stats['rendered'] += 1
 
-<!-- Supercounters (optional) -->
-<div style="position:fixed;top:0;left:0;width:100%;height:1px;overflow:hidden;visibility:hidden;z-index:9999;">
-    <script type="text/javascript" src="//widget.supercounters.com/ssl/online_i.js"></script>
-    <script type="text/javascript">sc_online_i(1727928,"ffffff","ffffff");</script>
-    <noscript><a href="https://www.supercounters.com/" style="visibility:hidden;">free online counter</a></noscript>
-</div>
+    if not force and manifest.get(path) == digest and os.path.exists(path):
+        stats['skipped'] += 1
+        return False
 
-</body>
-</html>"""
+    with open(path, "w", encoding='utf-8') as f_out:
+        f_out.write(html)
+    manifest[path] = digest
+    stats['written'] += 1
+    return True
 
-def build_site():
-    if not os.path.exists(JSON_FILE):
-        print(f"Error: {JSON_FILE} not found.")
-        return
+def content_keys(months, assets=None):
+    """{page path: hash of what the page shows that does not depend on today's date}.
 
-    with open(JSON_FILE, 'r', encoding='utf-8') as f:
-        content = json.load(f)
-        data = content[0] if isinstance(content, list) else content
-    
-    # Pre-collect all days from all months to ensure we have the full year's data for countdowns
-    all_year_days = []
-    for m in data['calendar_data']:
-        all_year_days.extend(m['days'])
-
-    files_count = 0
-    for m_data in data['calendar_data']:
-        label = f"{' / '.join(m_data['bs_months'])} {data.get('year', '')}"
-        
-        # We need to tell the template which days belong to the current month view
-        global target_day_context_days
-        target_day_context_days = m_data['days']
+    Countdowns, the upcoming events, the FAQ answers, the grid highlight and data-built move
+    with "today" on every page, so they are left out: the key of a day page only changes with
+    its own day, its month grid and the template. The template's part is a probe page rendered
+    with no events and no highlight, so refactors that leave the output alone keep every key.
+    """
+    no_events = DateTable.from_days([])
+    first = months[0]
+    probe = get_html_template(first['days'][0], no_events, first['label'], first['month'],
+                              build_month_grid(first['days'])[0], assets)
+    template = hashlib.sha256(probe.replace(f' data-built="{TODAY_AD_STR}"', '').encode('utf-8')).hexdigest()
 
+    keys = {}
+    for m_data in months:
+        month = json.dumps([template, m_data['label'], m_data['month'], build_month_grid(m_data['days'])[0]])
         for day in m_data['days']:
-            # Pass all_year_days so the FAQ and Upcoming section are never empty
-            html = get_html_template(day, all_year_days, label, m_data['month'])
-            
-            # UPDATED: Filename now includes the subdirectory path
-            filename = os.path.join(SUB_FOLDER, f"{day['bs']}.html")
-            
-            with open(filename, "w", encoding='utf-8') as f_out: 
-                f_out.write(html)
-            files_count += 1
-            
-            if day['ad'] == TODAY_AD_STR:
-                with open("index.html", "w", encoding='utf-8') as f_idx: 
-                    f_idx.write(html)
-        
-    print(f"Success! Generated {files_count} HTML files in /{SUB_FOLDER}/. index.html updated for {TODAY_AD_STR}.")
+            page = json.dumps([month, day], sort_keys=True)
+            keys[f"{SUB_FOLDER}/{day['bs']}.html"] = hashlib.sha256(page.encode('utf-8')).hexdigest()
+    return keys
+
+def save_content_keys(keys):
+    """Writes CONTENT_FILE when the keys changed. Returns True if it was written."""
+    if read_json(CONTENT_FILE) == keys:
+        return False
+    write_json(CONTENT_FILE, keys, sort_keys=True)
+    return True
+
+def write_shared_assets(manifest, stats, force=False):
+    """Writes the shared page chrome once as content-versioned files in ASSET_FOLDER.
+
+    Returns the {"css", "js", "counter"} URLs for get_html_template(). Versions that are no
+    longer current are deleted, since every page is re-rendered against the new names.
+    """
+    os.makedirs(ASSET_FOLDER, exist_ok=True)
+    # The footer moves into the script too, so day pages carry only their own data
+    site_js = f"document.querySelector('main').insertAdjacentHTML('afterend', {json.dumps(FOOTER_HTML)});\n{CLOCK_JS}\n\n{LIVE_JS}\n"
+    counter_html = f"<!DOCTYPE html>\n<html>\n<body>\n{COUNTER_HTML}\n</body>\n</html>\n"
+    sources = {"css": ("site", "css", SITE_CSS + "\n"), "js": ("site", "js", site_js), "counter": ("counter", "html", counter_html)}
+
+    assets, current = {}, set()
+    for key, (name, ext, content) in sources.items():
+        version = hashlib.sha256(content.encode('utf-8')).hexdigest()[:10]
+        path = f"{ASSET_FOLDER}/{name}.{version}.{ext}"
+        write_page(path, content, manifest, stats, force)
+        assets[key] = f"/{path}"
+        current.add(path)
+
+    for path in [p for p in manifest if p.startswith(f"{ASSET_FOLDER}/") and p not in current]:
+        # Also drop any pre-compressed siblings left by --compress
+        for stale in (path, path + ".gz", path + ".br"):
+            if os.path.exists(stale):
+                os.remove(stale)
+        del manifest[path]
+    return assets
+
+def build_calendar_index(months):
+    """Serializes the merged calendar compactly for the in-page "today" script.
+
+    Each day is an [ad, bs, weekday, event] row, grouped by month so index.html can redraw its grid.
+    """
+    index = {
+        "base": f"{DOMAIN}/{SUB_FOLDER}/",
+        "months": [{"label": m['label'], "days": [[d['ad'], d['bs'], d['day'], d.get('event')] for d in m['days']]}
+                   for m in months],
+    }
+    return json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+
+def load_calendar(json_files):
+    """Loads one or more calendar files and merges them into month records sorted by AD date.
+
+    Accepts both the yearly {"year", "calendar_data"} layout and the single-month
+    {"month_info", "days"} layout. Days are deduped by AD date; the first file listing a date wins.
+    """
+    months = {}
+    seen_ad = set()
+    for month, ad_year, bs_months, days in read_calendar_months(json_files):
+        record = months.setdefault((ad_year, month), {
+            "month": month,
+            "label": f"{' / '.join(bs_months)} {ad_year}",
+            "days": [],
+        })
+        for day in days:
+            if day['ad'] not in seen_ad:
+                seen_ad.add(day['ad'])
+                record['days'].append(day)
+
+    records = [m for m in months.values() if m['days']]
+    for m in records:
+        m['days'].sort(key=lambda d: d['ad'])
+    records.sort(key=lambda m: m['days'][0]['ad'])
+    return records
+
+def render_month(m_data, date_table, assets=None):
+    """Renders every day page of one month. Returns the HTML strings in day order."""
+    # The month grid is built once; the highlighted cell is today's, so every page of the month shares it
+    calendar_html = highlight_grid(build_month_grid(m_data['days']), TODAY_AD_STR)
+
+    # Pass the full-calendar table so the FAQ and Upcoming section are never empty
+    return [get_html_template(day, date_table, m_data['label'], m_data['month'], calendar_html, assets)
+            for day in m_data['days']]
+
+def _init_worker(today_ad_str, today_ordinal):
+    # Pin workers to the parent's "today" so a pool build matches a serial one even across midnight
+    global TODAY_AD_STR, TODAY_ORDINAL
+    TODAY_AD_STR, TODAY_ORDINAL = today_ad_str, today_ordinal
+
+def set_today(now=None):
+    """Pins "today" for the pages to `now`, or to the current Nepal time."""
+    now = now or datetime.now(LOCAL_OFFSET)
+    _init_worker(now.strftime('%Y-%m-%d'), now.date().toordinal())
+
+def render_months(months, date_table, jobs=1, assets=None):
+    """Renders all months, serially or across a pool of `jobs` processes. Output order is preserved."""
+    if jobs <= 1 or len(months) <= 1:
+        return [render_month(m, date_table, assets) for m in months]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(TODAY_AD_STR, TODAY_ORDINAL)) as pool:
+        return list(pool.map(render_month, months, repeat(date_table), repeat(assets)))
+
+def build_site(json_files=None, force=False, jobs=1, split_assets=False, compress=False, months=None, now=None):
+    """Renders and writes the site. `months` may be passed in already loaded (see scheduler.py),
+    and `now` pins the build's date (current Nepal time by default)."""
+    if months is None:
+        with metrics.stage("load_calendar"):
+            months = load_calendar(json_files or JSON_FILES)
+    if not months:
+        print("Error: no calendar data loaded.")
+        return
+
+    set_today(now)
+    os.makedirs(SUB_FOLDER, exist_ok=True)
+
+    # One table over all months, so countdowns and "today" lookups cover the full calendar
+    date_table = DateTable.from_months(months)
+
+    manifest = read_json(MANIFEST_FILE)
+    old_manifest = dict(manifest)
+    stats = {"rendered": 0, "skipped": 0, "written": 0}
+    assets = write_shared_assets(manifest, stats, force) if split_assets else None
+    outputs = [url.lstrip("/") for url in assets.values()] if assets else []
+
+    # The pages fetch this to keep "today" and the countdowns current between rebuilds
+    write_page(CALENDAR_INDEX_FILE, build_calendar_index(months), manifest, stats, force)
+    outputs.append(CALENDAR_INDEX_FILE)
+
+    with metrics.stage("render"):
+        rendered = render_months(months, date_table, jobs, assets)
+    with metrics.stage("write"):
+        for m_data, pages in zip(months, rendered):
+            for day, html in zip(m_data['days'], pages):
+                # UPDATED: Filename now includes the subdirectory path
+                filename = os.path.join(SUB_FOLDER, f"{day['bs']}.html")
+                write_page(filename, html, manifest, stats, force)
+                outputs.append(filename)
+
+    today_month = date_table.month_index(TODAY_ORDINAL)
+    if today_month is not None:
+        # index.html is the live copy: it also redraws its header when the date rolls over
+        m_data = months[today_month]
+        calendar_html = highlight_grid(build_month_grid(m_data['days']), TODAY_AD_STR)
+        index_html = get_html_template(date_table.day(TODAY_ORDINAL), date_table, m_data['label'], m_data['month'],
+                                       calendar_html, assets, live=True)
+        write_page("index.html", index_html, manifest, stats, force)
+        outputs.append("index.html")
+
+    if manifest != old_manifest:
+        write_json(MANIFEST_FILE, manifest, sort_keys=True)
+    # index.html is left out: it is today's page, so the sitemap hashes it like any other file
+    save_content_keys(content_keys(months, assets))
+    metrics.count("pages_written", stats['written'])
+    metrics.count("pages_skipped", stats['skipped'])
+
+    print(f"Success! Rendered {stats['rendered']} pages for {TODAY_AD_STR}: "
+          f"{stats['written']} written, {stats['skipped']} unchanged (skipped).")
+
+    if compress:
+        from compress_output import compress_files
+        with metrics.stage("compress"):
+            compress_files(outputs, force)
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the Nepali date pages.")
+    parser.add_argument("json_files", nargs="*", help=f"Calendar JSON files to merge (default: {' '.join(JSON_FILES)}).")
+    parser.add_argument("--force", action="store_true", help="Rewrite every page even if its content is unchanged.")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Render pages across this many processes.")
+    parser.add_argument("--split-assets", action="store_true",
+                        help=f"Write the shared CSS/JS/footer once to /{ASSET_FOLDER}/ instead of inlining it in every page.")
+    parser.add_argument("--compress", action="store_true", help="Also write .gz/.br siblings of changed pages for the static host.")
+    args = parser.parse_args()
+    report = metrics.start("site")
+    build_site(args.json_files, force=args.force, jobs=args.jobs, split_assets=args.split_assets, compress=args.compress)
+    report.save()
+    print(report.summary())
 
-if __name__ == "__main__": 
-    build_site()
+if __name__ == "__main__":
+    main()
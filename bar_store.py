@@ -0,0 +1,125 @@
+"""Local OHLCV bar cache for collect_data.py, one NumPy file per exchange, symbol and interval.
+
+Bars are kept as a structured array (time, open, high, low, close, volume) in STORE_DIR,
+sorted by time, where `time` is the bar's open time in seconds as TvDatafeed labels it.
+A run only asks upstream for the bars since the newest stored one (plus that bar again, since
+it may still have been forming). xauusd.yml saves the store after every run under a run-unique
+cache key and restores the newest one, so at its 15-minute schedule a tick fetches one or two
+bars per timeframe instead of N_BARS. When the store is lost, the next run refetches N_BARS.
+
+update() never passes stored bars off as current: a failed or empty fetch, or a newest bar
+that closed more than one interval ago (as outside market hours), returns no bars, so the
+caller reports the timeframe as failed instead of recording an old price under a new timestamp.
+
+fetch(n_bars) callables return TvDatafeed-style DataFrames: a datetime index and
+open/high/low/close/volume columns.
+"""
+import os
+from datetime import datetime
+
+import numpy as np
+
+# --- CONFIGURATION ---
+STORE_DIR = ".build/bars"
+MAX_BARS = 5000   # Kept per series; also TradingView's largest single request
+N_BARS = 50       # Fetched when a series has nothing stored yet
+
+BAR_DTYPE = np.dtype([("time", "i8"), ("open", "f8"), ("high", "f8"), ("low", "f8"),
+                      ("close", "f8"), ("volume", "f8")])
+
+def from_frame(df):
+    """Structured bars from a TvDatafeed DataFrame."""
+    bars = np.empty(len(df), dtype=BAR_DTYPE)
+    bars["time"] = df.index.values.astype("datetime64[s]").astype("i8")
+    for name in BAR_DTYPE.names[1:]:
+        bars[name] = df[name].values if name in df else np.nan
+    return bars
+
+def _now_seconds():
+    # TvDatafeed labels bars in naive local time, so "now" is measured the same way
+    return np.datetime64(datetime.now(), "s").astype("i8")
+
+def is_stale(bars, minutes, now):
+    """True if the newest bar closed more than one interval before now.
+
+    Bar times are open times, so the forming bar opened less than one interval ago; one more
+    interval of slack covers a provider that has not started the new bar yet.
+    """
+    return len(bars) == 0 or int(now) - int(bars["time"][-1]) > 2 * minutes * 60
+
+class BarStore:
+    def __init__(self, directory=STORE_DIR, max_bars=MAX_BARS):
+        self.directory = directory
+        self.max_bars = max_bars
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, exchange, symbol, interval):
+        return os.path.join(self.directory, f"{exchange}_{symbol}_{interval}.npy".replace(":", "_"))
+
+    def load(self, exchange, symbol, interval):
+        """Stored bars, oldest first (memory-mapped; empty if nothing is stored)."""
+        path = self.path(exchange, symbol, interval)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.load(path, mmap_mode="r")
+
+    def merge(self, exchange, symbol, interval, bars):
+        """Adds bars, replacing stored ones with the same time. Returns how many times were new."""
+        stored = np.array(self.load(exchange, symbol, interval))
+        if len(bars) == 0:
+            return 0
+        new_count = int(np.count_nonzero(~np.isin(bars["time"], stored["time"])))
+        # Fetched bars go last so np.unique keeps them over the stored copies
+        combined = np.concatenate([stored, bars])
+        _, first = np.unique(combined["time"][::-1], return_index=True)
+        merged = combined[::-1][first][-self.max_bars:]
+
+        path = self.path(exchange, symbol, interval)
+        tmp_path = path + ".tmp.npy"
+        np.save(tmp_path, merged)
+        os.replace(tmp_path, path)
+        return new_count
+
+    def missing_bars(self, exchange, symbol, interval, minutes, now=None):
+        """How many bars to fetch to reach from the newest stored bar (inclusive) to now."""
+        stored = self.load(exchange, symbol, interval)
+        if len(stored) == 0:
+            return None
+        now = _now_seconds() if now is None else now
+        elapsed = max(0, int(now) - int(stored["time"][-1]))
+        return elapsed // (minutes * 60) + 1
+
+    def update(self, exchange, symbol, interval, minutes, fetch, n_bars=N_BARS, now=None):
+        """Fetches only the bars newer than the stored ones and returns the last n_bars.
+
+        Falls back to fetching n_bars when fewer are stored, or when the delta would not
+        overlap the stored bars (so no gap is ever left between them). Returns no bars when the
+        fetch fails or comes back empty, or when the newest bar is stale (see is_stale()).
+        """
+        now = _now_seconds() if now is None else now
+        if len(self.load(exchange, symbol, interval)) < n_bars:
+            count = n_bars
+        else:
+            count = min(self.missing_bars(exchange, symbol, interval, minutes, now), self.max_bars)
+        df = fetch(count)
+        if df is None or df.empty:
+            return np.empty(0, dtype=BAR_DTYPE)
+        fetched = from_frame(df)
+
+        stored = self.load(exchange, symbol, interval)
+        if len(stored) and fetched["time"][0] > stored["time"][-1] and count < n_bars:
+            df = fetch(n_bars)
+            if df is not None and not df.empty:
+                fetched = from_frame(df)
+        self.merge(exchange, symbol, interval, fetched)
+        bars = np.array(self.load(exchange, symbol, interval)[-n_bars:])
+        if is_stale(bars, minutes, now):
+            return np.empty(0, dtype=BAR_DTYPE)
+        return bars
+
+    def backfill(self, exchange, symbol, interval, fetch, n_bars=MAX_BARS):
+        """Fetches up to n_bars of history into the store. Returns how many bars were new."""
+        df = fetch(min(n_bars, self.max_bars))
+        if df is None or df.empty:
+            return 0
+        return self.merge(exchange, symbol, interval, from_frame(df))
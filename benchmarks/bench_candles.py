@@ -0,0 +1,211 @@
+"""Candlestick pattern detection per collect_data.py tick.
+
+Generates a reproducible bar fixture (a random walk with engulfing, doji and hammer candles
+planted in it), checks candles.py against a plain per-bar transcription of the pandas_ta /
+TA-Lib rules and, when pandas_ta is installed, against df.ta.cdl_pattern itself. Then times
+the old path (cdl_pattern over a 50-bar frame) against candles.last_patterns and
+PatternEngine.update, and the import cost of each.
+
+--record writes a reference fixture for tests/test_candles.py: bars with the CDL_ENGULFING,
+CDL_DOJI_10_0.1 and CDL_HAMMER columns pandas_ta returns for them. It needs pandas_ta and
+TA-Lib; the bars come from a CSV with open/high/low/close columns (--bars), or are fetched
+from TradingView through collect_data.py when tvDatafeed is installed.
+
+Run from the repository root:
+    python benchmarks/bench_candles.py
+    python benchmarks/bench_candles.py --record tests/fixtures/candles/xauusd_15m_pandas_ta.csv
+"""
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import candles
+
+BARS = 5000
+FRAME = 50  # Bars collect_data.py fetches per timeframe
+TICKS = 500
+
+
+def fixture(n=BARS, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 2000 + np.cumsum(rng.normal(0, 2, n))
+    open_ = close + rng.normal(0, 2, n)
+    high = np.maximum(open_, close) + rng.exponential(1.5, n)
+    low = np.minimum(open_, close) - rng.exponential(1.5, n)
+    for i in rng.choice(np.arange(12, n), n // 10, replace=False):
+        kind = i % 3
+        if kind == 0:    # Engulfing: reverse and swallow the previous body
+            open_[i], close[i] = close[i - 1], open_[i - 1] + 2 * (open_[i - 1] - close[i - 1])
+        elif kind == 1:  # Doji, sometimes exactly flat
+            close[i] = open_[i] + (0 if i % 2 else 0.05)
+        else:            # Hammer: tiny body on top of a long lower wick below the last low
+            low[i] = low[i - 1] - 6
+            open_[i] = low[i] + 7
+            close[i] = open_[i] + 0.3
+            high[i] = close[i] + 0.02
+        high[i] = max(high[i], open_[i], close[i])
+        low[i] = min(low[i], open_[i], close[i])
+    return open_, high, low, close
+
+
+def reference(open_, high, low, close):
+    """Bar-by-bar transcription of pandas_ta cdl_doji and TA-Lib CDLENGULFING / CDLHAMMER."""
+    n = len(close)
+    eps = sys.float_info.epsilon
+    flat_range = any(high[i] == low[i] for i in range(n))
+    flat_body = any(close[i] == open_[i] for i in range(n))
+    out = {name: [0] * n for name in candles.DETECTORS}
+    for i in range(n):
+        color = 1 if close[i] >= open_[i] else -1
+        if i >= 1:
+            prev = 1 if close[i - 1] >= open_[i - 1] else -1
+            o, c, po, pc = open_[i], close[i], open_[i - 1], close[i - 1]
+            if ((color == 1 and prev == -1 and ((c >= po and o < pc) or (c > po and o <= pc))) or
+                    (color == -1 and prev == 1 and ((o >= pc and c < po) or (o > pc and c <= po)))):
+                out["engulfing"][i] = color * (100 if o != pc and c != po else 80)
+        if i >= candles.DOJI_LENGTH - 1:
+            window = range(i - candles.DOJI_LENGTH + 1, i + 1)
+            hl_avg = sum(high[j] - low[j] + (eps if flat_range else 0) for j in window) / candles.DOJI_LENGTH
+            body = abs(close[i] - open_[i] + (eps if flat_body else 0))
+            out["doji"][i] = 100 if body < 0.01 * candles.DOJI_FACTOR * hl_avg else 0
+        if i >= candles.HAMMER_LOOKBACK:
+            body = abs(close[i] - open_[i])
+            body_avg = sum(abs(close[j] - open_[j]) for j in range(i - 10, i)) / 10
+            range_avg = sum(high[j] - low[j] for j in range(i - 10, i)) / 10
+            near_avg = sum(high[j] - low[j] for j in range(i - 6, i - 1)) / 5
+            if (body < body_avg and min(open_[i], close[i]) - low[i] > body and
+                    high[i] - max(open_[i], close[i]) < 0.1 * range_avg and
+                    min(open_[i], close[i]) <= low[i - 1] + 0.2 * near_avg):
+                out["hammer"][i] = 100
+    return out
+
+
+def pandas_ta_patterns(open_, high, low, close):
+    import pandas as pd
+    import pandas_ta  # noqa: F401 (registers the .ta accessor)
+    df = pd.DataFrame({"open": open_, "high": high, "low": low, "close": close})
+    patterns = df.ta.cdl_pattern(name=list(candles.DETECTORS))
+    return {name: patterns[col].astype(int).tolist() for name, col in candles.COLUMNS.items()
+            if col in patterns}
+
+
+def write_reference(path, bars, expected, source, timestamps=None):
+    """Writes bars and their expected pattern columns as a tests/fixtures/candles CSV."""
+    columns = [candles.COLUMNS[name] for name in candles.DETECTORS]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', newline='') as f:
+        f.write(f"# {source}\n")
+        writer = csv.writer(f)
+        writer.writerow(["datetime", "open", "high", "low", "close"] + columns)
+        for i in range(len(bars[0])):
+            writer.writerow([timestamps[i] if timestamps is not None else i] + [repr(float(x[i])) for x in bars]
+                            + [int(expected[name][i]) for name in candles.DETECTORS])
+
+
+def record(path, bars_csv=None, n_bars=500):
+    """Records pandas_ta's (with TA-Lib) output on real bars to path."""
+    import pandas as pd
+    try:
+        import pandas_ta  # noqa: F401
+        import talib  # noqa: F401 (pandas_ta only has CDL_ENGULFING and CDL_HAMMER through TA-Lib)
+    except ImportError as e:
+        sys.exit(f"--record needs pandas_ta and TA-Lib: {e}")
+    if bars_csv:
+        df = pd.read_csv(bars_csv, index_col=0, comment="#")
+        source = f"bars from {os.path.basename(bars_csv)}"
+    else:
+        sys.path.insert(0, ROOT)
+        import collect_data
+        df = collect_data.fetch_bars("in_15_minute", n_bars)
+        if df is None or df.empty:
+            sys.exit("No bars returned by TradingView")
+        source = f"{collect_data.EXCHANGE}:{collect_data.SYMBOL} 15m bars from TradingView"
+    df.columns = [c.lower() for c in df.columns]
+    bars = tuple(df[c].to_numpy(dtype=float) for c in ("open", "high", "low", "close"))
+    expected = pandas_ta_patterns(*bars)
+    missing = [candles.COLUMNS[name] for name in candles.DETECTORS if name not in expected]
+    if missing:
+        sys.exit(f"pandas_ta returned no {', '.join(missing)} column")
+    write_reference(path, bars, expected, f"{source}; expected columns from pandas_ta {pandas_ta.version} with TA-Lib",
+                    [str(t) for t in df.index])
+    print(f"Recorded {len(df)} bars to {path}")
+
+
+def compare(label, expected, bars):
+    got = candles.detect(*bars)
+    for name, values in expected.items():
+        mismatches = int(np.sum(np.asarray(values) != got[name]))
+        hits = int(np.count_nonzero(got[name]))
+        status = "match" if mismatches == 0 else f"MISMATCH ({mismatches} bars)"
+        print(f"  {label:>10} {name:>9}: {hits:5d} hits  {status}")
+
+
+def import_seconds(module):
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    return float(result.stdout) if result.returncode == 0 else None
+
+
+def timed(fn, repeat=TICKS):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Candlestick pattern checks and timings.")
+    parser.add_argument("--record", metavar="PATH", help="Write a pandas_ta reference fixture to PATH and exit")
+    parser.add_argument("--bars", metavar="CSV", help="With --record: real bars to use instead of fetching them")
+    args = parser.parse_args()
+    if args.record:
+        record(args.record, args.bars)
+        return
+
+    bars = fixture()
+    print(f"Fixture: {BARS} bars")
+    compare("reference", reference(*bars), bars)
+    try:
+        expected = pandas_ta_patterns(*bars)
+    except ImportError:
+        expected = None
+        print("  pandas_ta not installed, skipping the cdl_pattern comparison")
+    if expected is not None:
+        compare("pandas_ta", expected, bars)
+
+    # The newest-bar shortcuts must agree with the full series
+    full = candles.detect(*bars)
+    engine = candles.PatternEngine()
+    agree = True
+    for i in range(BARS):
+        step = engine.update(*(x[i] for x in bars))
+        tail = candles.last_patterns(*(x[max(0, i - FRAME + 1):i + 1] for x in bars))
+        if i >= FRAME and (step != tail or any(step[name] != full[name][i] for name in full)):
+            agree = False
+    print(f"  last_patterns / PatternEngine vs detect: {'match' if agree else 'MISMATCH'}")
+
+    frame = [x[-FRAME:] for x in bars]
+    print(f"\nPer tick ({FRAME}-bar frame):")
+    if expected is not None:
+        print(f"  {'cdl_pattern':>14}: {timed(lambda: pandas_ta_patterns(*frame)) * 1e6:8.1f} us")
+    print(f"  {'last_patterns':>14}: {timed(lambda: candles.last_patterns(*frame)) * 1e6:8.1f} us")
+    engine = candles.PatternEngine()
+    for i in range(candles.LOOKBACK):
+        engine.update(*(x[i] for x in frame))
+    print(f"  {'engine.update':>14}: {timed(lambda: engine.update(*(x[-1] for x in frame))) * 1e6:8.1f} us")
+
+    print("\nCold import:")
+    for module in ("pandas_ta", "candles"):
+        seconds = import_seconds(module)
+        print(f"  {module:>14}: " + (f"{seconds * 1000:8.1f} ms" if seconds is not None else "not installed"))
+
+
+if __name__ == "__main__":
+    main()
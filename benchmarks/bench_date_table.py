@@ -0,0 +1,92 @@
+"""BS <-> AD conversion: scanning the per-day dicts vs nepali_calendar.DateTable.
+
+Converts every day of 1 to 10 years of (synthetic) calendar data in both directions and
+lists each month's events, first by scanning the day lists the way 100.py used to, then
+through the array-backed table. Also reports the table's build time and export sizes.
+
+Run from the repository root:
+    python benchmarks/bench_date_table.py
+"""
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from nepali_calendar import DateTable, JSON_FILES, read_calendar_months
+
+YEARS = [1, 2, 5, 10]
+
+
+def synthetic_days(base_days, years):
+    """Repeats the base calendar back to back `years` times, shifting AD dates and BS years forward."""
+    span = (date.fromisoformat(base_days[-1]['ad']) - date.fromisoformat(base_days[0]['ad'])).days + 1
+    days = []
+    for k in range(years):
+        for d in base_days:
+            bs_year, rest = d['bs'].split('-', 1)
+            ad = date.fromisoformat(d['ad']) + timedelta(days=span * k)
+            days.append(dict(d, ad=ad.isoformat(), bs=f"{int(bs_year) + k}-{rest}"))
+    return days
+
+
+def scan_ad_to_bs(days, ad):
+    for d in days:
+        if d['ad'] == ad:
+            return d['bs']
+
+
+def scan_bs_to_ad(days, bs):
+    for d in days:
+        if d['bs'] == bs:
+            return d['ad']
+
+
+def scan_events(days, start, end):
+    return [{"event": d['event'], "bs": d['bs'], "ad": d['ad']} for d in days if d.get('event') and start <= d['ad'] <= end]
+
+
+def month_range(month):
+    first = date.fromisoformat(f"{month}-01")
+    return first, (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    seen, base_days = set(), []
+    for *_, days in read_calendar_months(JSON_FILES):
+        for d in days:
+            if d['ad'] not in seen:
+                seen.add(d['ad'])
+                base_days.append(d)
+    base_days.sort(key=lambda d: d['ad'])
+
+    print(f"{'years':>5} {'days':>6} {'scan (s)':>9} {'build (ms)':>10} {'table (s)':>10} {'speedup':>8} "
+          f"{'bin (KB)':>9} {'json (KB)':>10}  check")
+    for years in YEARS:
+        days = synthetic_days(base_days, years)
+        months = [month_range(m) for m in sorted({d['ad'][:7] for d in days})]
+
+        def scan():
+            return ([scan_ad_to_bs(days, d['ad']) for d in days], [scan_bs_to_ad(days, d['bs']) for d in days],
+                    [scan_events(days, first.isoformat(), last.isoformat()) for first, last in months])
+
+        def lookups(table):
+            return ([table.ad_to_bs(d['ad']) for d in days], [table.bs_to_ad(d['bs']) for d in days],
+                    [table.events_between(first, last) for first, last in months])
+
+        t_scan, expected = timed(scan)
+        t_build, table = timed(lambda: DateTable.from_days(days))
+        t_table, got = timed(lambda: lookups(table))
+        status = "match" if got == expected else "MISMATCH"
+        print(f"{years:>5} {len(days):>6} {t_scan:>9.3f} {t_build * 1000:>10.1f} {t_table:>10.4f} "
+              f"{t_scan / t_table:>7.0f}x {len(table.to_bytes()) / 1024:>9.1f} {len(table.to_json()) / 1024:>10.1f}  {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Build-time scaling of the upcoming-events lookup in 100.py.
+
+Compares the old per-page rescan of every calendar day against the
+precomputed DateTable, for 1 to 10 years of (synthetic) calendar data.
+
+Run from the repository root:
+    python benchmarks/bench_event_index.py
+"""
+import importlib
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+site = importlib.import_module("100")
+from nepali_calendar import DateTable
+
+YEARS = [1, 2, 5, 10]
+
+
+def load_year_days():
+    return [day for m in site.load_calendar(site.JSON_FILES) for day in m['days']]
+
+
+def synthetic_days(base_days, years):
+    """Repeats the base calendar `years` times, shifting AD and BS years forward."""
+    days = []
+    for k in range(years):
+        for d in base_days:
+            ad = datetime.strptime(d['ad'], '%Y-%m-%d')
+            bs_year, rest = d['bs'].split('-', 1)
+            days.append(dict(d, ad=ad.replace(year=ad.year + k).strftime('%Y-%m-%d'),
+                             bs=f"{int(bs_year) + k}-{rest}"))
+    return days
+
+
+def legacy_upcoming(full_year_days, today_str):
+    """The pre-index lookup: strptime every event date for every page."""
+    today_dt = datetime.strptime(today_str, '%Y-%m-%d')
+    upcoming = []
+    for d in full_year_days:
+        if d.get('event'):
+            days_left = (datetime.strptime(d['ad'], '%Y-%m-%d') - today_dt).days
+            if days_left >= 0:
+                upcoming.append({"event": d['event'], "bs": d['bs'], "ad": d['ad'], "days_left": days_left})
+    return sorted(upcoming, key=lambda x: x['days_left'])
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    base_days = load_year_days()
+    # Put "today" before the first day so every event counts as upcoming (worst case)
+    today = min(d['ad'] for d in base_days)
+    today_ordinal = datetime.strptime(today, '%Y-%m-%d').toordinal()
+
+    print(f"{'years':>5} {'pages':>6} {'rescan (s)':>11} {'table (s)':>10} {'speedup':>8}")
+    for years in YEARS:
+        days = synthetic_days(base_days, years)
+
+        def rescan():
+            for _ in days:
+                legacy_upcoming(days, today)
+
+        def indexed():
+            date_table = DateTable.from_days(days)
+            for _ in days:
+                date_table.upcoming_events(today_ordinal)
+
+        t_old = timed(rescan)
+        t_new = timed(indexed)
+        print(f"{years:>5} {len(days):>6} {t_old:>11.3f} {t_new:>10.3f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Offline timings of the pipeline entry points, with a regression check against a baseline.
+
+Nothing touches the network. Every case reads the fixtures committed in benchmarks/fixtures/,
+so runs on different days and checkouts time the same input:
+    gsmarena_synthetic.json.gz  a homepage and device pages ({"targets", "homepage", "devices"}),
+                                served to the real Fetcher by a stub session
+    xauusd_1m_synthetic.csv     one-minute OHLCV bars, analysed in 50-bar frames
+    calendar/                   the calendar files the site is built from (a copy of date/)
+The first two are synthetic, not captured from GSMArena or TradingView: the pages are
+bench_spec_parser.py's template filled with the saved latest/ and data/ specs.json files, and
+the bars are bench_candles.py's seeded random walk. They time the parsing and analysis code
+on realistic sizes, but do not cover markup or data quirks that only real responses have.
+--synthesize regenerates all three.
+
+Every case runs REPEAT times in a scratch directory, in rounds that interleave the cases, and
+reports its best time and the stage breakdown metrics.py recorded on the last run. --save
+writes the best times to a JSON file, along with a calibration workload's time. --compare
+scales the saved times by how fast the calibration runs now and exits 1 when a case is more
+than TOLERANCE and MIN_DELTA slower, so it can gate a deploy; the best of many interleaved
+runs is far steadier than a median of a few.
+test_bench_pipeline.py runs the same cases under pytest-benchmark.
+
+Run from the repository root:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --save .build/bench_baseline.json
+    python benchmarks/bench_pipeline.py --compare .build/bench_baseline.json
+    python benchmarks/bench_pipeline.py --synthesize
+"""
+import argparse
+import contextlib
+import csv
+import gzip
+import importlib
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "scrapers"), os.path.join(ROOT, "benchmarks")]
+import metrics
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+PAGES_FIXTURE = os.path.join(FIXTURES, "gsmarena_synthetic.json.gz")
+BARS_FIXTURE = os.path.join(FIXTURES, "xauusd_1m_synthetic.csv")
+CALENDAR_FIXTURE = os.path.join(FIXTURES, "calendar")
+REPEAT = 15
+TOLERANCE = 0.5   # Fraction slower than the baseline's best time that counts as a regression
+MIN_DELTA = 0.01  # Seconds; smaller slowdowns are timer noise, whatever their fraction
+CALIBRATION = "_calibration"  # Baseline key holding calibrate()'s best time
+FRAME = 50        # Bars per analyze_patterns call, as collect_data.py fetches
+TICKS = 200
+DEVICES = 12      # Device pages built from each of latest/ and data/
+CALENDAR_FILES = ["date/2026.json"]
+BUILD_DATE = datetime(2026, 2, 10, 12)
+ANNOUNCED = "2026, February 10"
+TARGET_MONTHS = ["2026, February", "2026, January"]
+
+
+class StubResponse:
+    def __init__(self, url, body):
+        self.url = url
+        self.status_code = 200 if body is not None else 404
+        self.content = (body or "").encode("utf-8")
+        self.text = body or ""
+        self.headers = {}
+
+
+class StubSession:
+    """Just enough of requests.Session for Fetcher: serves a {url: html} dict, 404 otherwise."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.headers = {}
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def get(self, url, **kwargs):
+        return StubResponse(url, self.pages.get(url))
+
+
+def saved_devices():
+    """(mobile_id, name, specs, image_url) for the first DEVICES saved specs.json folders of each source."""
+    devices = {}
+    for source in ["latest", "data"]:
+        folder = os.path.join(ROOT, source)
+        names = [name for name in sorted(os.listdir(folder)) if os.path.isfile(os.path.join(folder, name, "specs.json"))]
+        for name in names[:DEVICES]:
+            model, _, mobile_id = name.rpartition("-")
+            with open(os.path.join(folder, name, "specs.json"), 'r') as f:
+                saved = json.load(f)
+            devices.setdefault(mobile_id, (mobile_id, model.replace("_", " "), saved.get("specifications", saved),
+                                           saved.get("device_image_url", "x.jpg")))
+    return list(devices.values())
+
+
+def synthesize():
+    """Regenerates benchmarks/fixtures/ from the saved specs, the seeded bar walk and date/."""
+    from bench_candles import fixture
+    from bench_spec_parser import device_page
+
+    # Every device announced in TARGET_MONTHS, so scrape_latest keeps and writes it
+    devices = saved_devices()
+    pages = {mobile_id: device_page(name, dict(specs, Launch=dict(specs.get("Launch", {}), Announced=ANNOUNCED)), image)
+             for mobile_id, name, specs, image in devices}
+    links = "".join(f'<a class="module-phones-link" href="{name.replace(" ", "_")}-{mobile_id}.php">x</a>'
+                    for mobile_id, name, _, _ in devices)
+    os.makedirs(FIXTURES, exist_ok=True)
+    with gzip.open(PAGES_FIXTURE, 'wt', encoding='utf-8') as f:
+        json.dump({"targets": TARGET_MONTHS, "homepage": f"<html><body>{links}</body></html>", "devices": pages},
+                  f, indent=1, sort_keys=True)
+
+    columns = fixture(FRAME + TICKS)
+    start = datetime(2026, 2, 10, 9).timestamp()
+    with open(BARS_FIXTURE, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["datetime", "open", "high", "low", "close", "volume"])
+        for i, bar in enumerate(zip(*columns)):
+            writer.writerow([datetime.fromtimestamp(start + 60 * i).strftime("%Y-%m-%d %H:%M:%S")]
+                            + [f"{value:.2f}" for value in bar] + [1])
+
+    shutil.rmtree(CALENDAR_FIXTURE, ignore_errors=True)
+    os.makedirs(CALENDAR_FIXTURE)
+    for path in CALENDAR_FILES:
+        shutil.copy(os.path.join(ROOT, path), CALENDAR_FIXTURE)
+    print(f"Wrote {len(pages)} synthetic device pages, {FRAME + TICKS} bars and {len(CALENDAR_FILES)} calendar files "
+          f"to {os.path.relpath(FIXTURES, ROOT)}/")
+
+
+@contextlib.contextmanager
+def scratch_dir(**copies):
+    """A temporary working directory holding copies of the given folders, as {name: source}."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, source in copies.items():
+            shutil.copytree(source, os.path.join(tmp, name))
+        os.chdir(tmp)
+        try:
+            yield tmp
+        finally:
+            os.chdir(cwd)
+
+
+def run_once(name, run, setup=None):
+    """Seconds of one `run` (after an untimed `setup`), plus the metrics report it recorded."""
+    with contextlib.ExitStack() as stack:
+        if setup:
+            with metrics.use(None):  # The setup's own builds are not part of the run
+                stack.enter_context(setup())
+        report = metrics.start(name)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run()
+        return time.perf_counter() - start, report
+
+
+def calibrate():
+    """Seconds of a fixed pure-Python workload: how fast this machine is right now."""
+    start = time.perf_counter()
+    rows = [{"id": i, "name": f"device-{i % 97}", "value": i * 0.5} for i in range(20000)]
+    json.loads(json.dumps(sorted(rows, key=lambda row: (row["name"], -row["id"]))))
+    return time.perf_counter() - start
+
+
+def cases():
+    site = importlib.import_module("100")
+    generate_sitemap = importlib.import_module("generate_sitemap")
+    collect_data = importlib.import_module("collect_data")
+    latest_scraper = importlib.import_module("latest_scraper")
+    batch_scraper = importlib.import_module("batch_scraper")
+    from fetcher import Fetcher
+    from spec_store import SpecStore
+    now = BUILD_DATE.replace(tzinfo=site.LOCAL_OFFSET)
+
+    def build_site():
+        site.build_site(CALENDAR_FILES, now=now)
+
+    def site_dir():
+        return scratch_dir(date=CALENDAR_FIXTURE)
+
+    @contextlib.contextmanager
+    def built_site():
+        with site_dir():
+            with contextlib.redirect_stdout(io.StringIO()):
+                build_site()
+            yield
+
+    with gzip.open(PAGES_FIXTURE, 'rt', encoding='utf-8') as f:
+        fixture = json.load(f)
+    pages = fixture["devices"]
+    latest_pages = {latest_scraper.BASE_URL: fixture["homepage"]}
+    batch_pages = {}
+    for mobile_id, page in pages.items():
+        batch_pages[f"{batch_scraper.BASE_URL}phone-recorder.php3?idPhone={mobile_id}"] = page
+    for link in re.findall(r'href="([^"]+-(\d+)\.php)"', fixture["homepage"]):
+        latest_pages[latest_scraper.BASE_URL + link[0]] = pages[link[1]]
+
+    def scrape_latest():
+        fetcher = Fetcher(session=StubSession(latest_pages), rate=0)
+        latest_scraper.scrape_latest(fetcher=fetcher, store=SpecStore(), targets=fixture["targets"])
+
+    def scrape_by_id():
+        fetcher, store = Fetcher(session=StubSession(batch_pages), rate=0), SpecStore()
+        for mobile_id in pages:
+            batch_scraper.scrape_by_id(mobile_id, fetcher, store)
+
+    import pandas as pd
+    bars = pd.read_csv(BARS_FIXTURE, index_col="datetime", parse_dates=True)
+    frames = [bars.iloc[i:i + FRAME].copy() for i in range(len(bars) - FRAME)]
+
+    def analyze_patterns():
+        for df in frames:
+            collect_data.analyze_patterns(df)
+
+    return [
+        ("build_site cold", build_site, site_dir, f"{len(CALENDAR_FILES)} calendar files"),
+        ("build_site warm", build_site, built_site, "every page unchanged"),
+        ("sitemap walk", generate_sitemap.generate, built_site, "built site"),
+        ("scrape_latest", scrape_latest, scratch_dir, f"{len(pages)} device pages"),
+        ("scrape_by_id", scrape_by_id, scratch_dir, f"{len(pages)} device pages"),
+        ("analyze_patterns", analyze_patterns, None, f"{len(frames)} frames of {FRAME} bars"),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmarks.")
+    parser.add_argument("--save", metavar="PATH", help="Write the best times to PATH as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Exit 1 if a case is slower than this baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help=f"Fraction slower that fails --compare (default {TOLERANCE})")
+    parser.add_argument("--synthesize", action="store_true",
+                        help="Regenerate the synthetic fixtures in benchmarks/fixtures/ and exit")
+    parser.add_argument("cases", nargs="*", help="Only run cases whose name starts with one of these")
+    args = parser.parse_args()
+    if args.synthesize:
+        synthesize()
+        return
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+
+    selected = [case for case in cases() if not args.cases or any(case[0].startswith(p) for p in args.cases)]
+    # Rounds interleave the cases, so a slow spell on the machine hits all of them alike
+    results, reports, calibration = {}, {}, float("inf")
+    for _ in range(REPEAT):
+        calibration = min(calibration, calibrate())
+        for name, run, setup, _ in selected:
+            seconds, reports[name] = run_once(name, run, setup)
+            results[name] = min(results.get(name, seconds), seconds)
+    # Baselines saved on a faster or slower machine are scaled by the calibration workload
+    scale = calibration / baseline.get(CALIBRATION, calibration)
+
+    regressions = []
+    print(f"{'case':<18} {'best (ms)':>11} {'baseline':>9}  {'fixture':<22} stages (last run)")
+    for name, _, _, description in selected:
+        seconds = results[name]
+        stages = ", ".join(f"{stage} {s['seconds'] * 1000:.0f}" for stage, s in
+                           sorted(reports[name].to_dict()["stages"].items(), key=lambda item: -item[1]["seconds"]))
+        status = ""
+        if name in baseline:
+            expected = baseline[name] * scale
+            change = seconds / expected - 1
+            status = f"{change:+.0%}"
+            if change > args.tolerance and seconds - expected > MIN_DELTA:
+                regressions.append(name)
+                status += " SLOWER"
+        print(f"{name:<18} {seconds * 1000:>11.1f} {status:>9}  {description:<22} {stages}")
+    if baseline:
+        print(f"Baseline scaled by {scale:.2f} for this machine's speed")
+    results[CALIBRATION] = calibration
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=1)
+        print(f"Saved baseline to {args.save}")
+    if regressions:
+        print(f"Regressions over {args.tolerance:.0%} and {MIN_DELTA * 1000:.0f} ms: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
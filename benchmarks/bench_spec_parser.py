@@ -0,0 +1,92 @@
+"""Micro-benchmark of GSMArena spec-page parsing.
+
+Rebuilds device pages from the specs.json files saved in latest/ and data/, then times the
+original BeautifulSoup extraction against each backend of scrapers/spec_parser.py and checks
+that every backend returns the same specs.
+
+Run from the repository root:
+    python benchmarks/bench_spec_parser.py
+"""
+import glob
+import html
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scrapers"))
+from bs4 import BeautifulSoup
+import spec_parser
+
+# Roughly the menus and sidebars that surround the spec tables on a real page
+FILLER = "".join(f'<li><a href="brand-{i}.php"><span>Brand {i}</span></a></li>' for i in range(400))
+
+
+def device_page(name, specs, image_url):
+    tables = []
+    for section, rows in specs.items():
+        cells = []
+        for i, (field, value) in enumerate(rows.items()):
+            th = f'<th rowspan="{len(rows)}" scope="row">{html.escape(section)}</th>' if i == 0 else ""
+            data_spec = ' data-spec="year"' if field == "Announced" else ""
+            cells.append(f'<tr>{th}<td class="ttl"><a href="glossary.php3">{html.escape(field)}</a></td>'
+                         f'<td class="nfo"{data_spec}>{html.escape(value)}</td></tr>')
+        tables.append(f'<table cellspacing="0">{"".join(cells)}</table>')
+    return (f'<html><body><ul class="brandmenu">{FILLER}</ul>'
+            f'<div class="specs-photo-main"><a href="#"><img src="{html.escape(image_url)}"></a></div>'
+            f'<h1 class="specs-phone-name-title">{html.escape(name)}</h1>'
+            f'<div id="specs-list">{"".join(tables)}</div></body></html>')
+
+
+def load_pages():
+    pages = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "latest", "*", "specs.json")) +
+                       glob.glob(os.path.join(ROOT, "data", "*", "specs.json"))):
+        with open(path, 'r') as f:
+            saved = json.load(f)
+        specs = saved.get("specifications", saved)
+        name = os.path.basename(os.path.dirname(path)).rsplit("-", 1)[0].replace("_", " ")
+        pages.append(device_page(name, specs, saved.get("device_image_url", "x.jpg")))
+    return pages
+
+
+def legacy_parse(page):
+    """The extraction the scrapers used before spec_parser.py."""
+    soup = BeautifulSoup(page, 'html.parser')
+    announced_tag = soup.find('td', {'data-spec': 'year'})
+    announced = announced_tag.text if announced_tag else ""
+    model_name = soup.find('h1', class_='specs-phone-name-title').text
+    specs = {}
+    for table in soup.find_all('table'):
+        section = table.find('th').text if table.find('th') else "General"
+        specs[section] = {tr.find('td', class_='ttl').text: tr.find('td', class_='nfo').text
+                          for tr in table.find_all('tr') if tr.find('td', class_='ttl')}
+    return model_name, announced, specs
+
+
+def main():
+    pages = load_pages()
+    if not pages:
+        print("No specs.json files found under latest/ or data/.")
+        return
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / len(pages) / 1024:.0f} KB average")
+
+    start = time.perf_counter()
+    expected = [legacy_parse(p) for p in pages]
+    baseline = time.perf_counter() - start
+    print(f"{'legacy bs4':>12}: {baseline / len(pages) * 1000:7.2f} ms/page")
+
+    for backend in spec_parser.available_backends():
+        start = time.perf_counter()
+        results = []
+        for p in pages:
+            device = spec_parser.parse_device_page(p, backend)
+            results.append((device.model_name, device.announced, device.specs))
+        elapsed = time.perf_counter() - start
+        status = "match" if results == expected else "MISMATCH"
+        print(f"{backend:>12}: {elapsed / len(pages) * 1000:7.2f} ms/page  {baseline / elapsed:5.1f}x  {status}")
+
+
+if __name__ == "__main__":
+    main()
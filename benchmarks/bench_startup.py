@@ -0,0 +1,79 @@
+"""Startup cost of every script: import time, cold interpreter start, and import side effects.
+
+Each module is imported in a fresh interpreter from an empty working directory, so nothing is
+cached in-process and any file or folder the import creates shows up. Reports:
+    import (ms)   the module's cumulative time from `python -X importtime`
+    startup (ms)  median wall time of `python -c "import <module>"`, over RUNS runs
+    over (ms)     startup minus a bare `python -c pass`
+    created       files or folders the import left in the working directory (should be none)
+    heaviest      its slowest direct imports (ms, including what they import)
+
+Run from the repository root:
+    python benchmarks/bench_startup.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["100", "collect_data", "generate_sitemap", "scheduler", "nepali_calendar", "value_store",
+           "bar_store", "candles", "latest_scraper", "batch_scraper", "catalog", "spec_store"]
+RUNS = 5
+HEAVIEST = 3
+
+
+def run(code, cwd, *flags):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, "scrapers")]),
+               PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *flags, "-c", code], cwd=cwd, env=env, capture_output=True, text=True)
+    return time.perf_counter() - start, result
+
+
+def parse_importtime(stderr):
+    """{name: cumulative ms} and {name: [(ms, child)]} for the top-level entries of -X importtime output."""
+    times, children, pending = {}, {}, []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        ms = int(cumulative) / 1000
+        # A module's own imports are reported, indented one level, just before it
+        if depth == 1:
+            pending.append((ms, name.strip()))
+        elif depth == 0:
+            times[name.strip()] = ms
+            children[name.strip()], pending = sorted(pending, reverse=True), []
+    return times, children
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cwd:
+        baseline = statistics.median(run("pass", cwd)[0] for _ in range(RUNS))
+    print(f"Bare interpreter start: {baseline * 1000:.0f} ms\n")
+    print(f"{'module':<18} {'import (ms)':>11} {'startup (ms)':>12} {'over (ms)':>9}  {'created':<10} heaviest")
+
+    for module in MODULES:
+        code = f"__import__({module!r})"  # importlib.import_module() is not reported by -X importtime
+        with tempfile.TemporaryDirectory() as cwd:
+            _, result = run(code, cwd, "-X", "importtime")
+            created = ",".join(sorted(os.listdir(cwd))) or "-"
+            if result.returncode != 0:
+                error = result.stderr.strip().splitlines()[-1]
+                print(f"{module:<18} failed: {error}")
+                continue
+            walls = [run(code, cwd)[0] for _ in range(RUNS)]
+
+        times, children = parse_importtime(result.stderr)
+        heaviest = children.get(module, [])[:HEAVIEST]
+        startup = statistics.median(walls)
+        print(f"{module:<18} {times.get(module, 0):>11.1f} {startup * 1000:>12.0f} {(startup - baseline) * 1000:>9.0f}  "
+              f"{created:<10} {', '.join(f'{name} {ms:.0f}' for ms, name in heaviest)}")
+
+
+if __name__ == "__main__":
+    main()
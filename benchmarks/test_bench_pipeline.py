@@ -0,0 +1,44 @@
+"""bench_pipeline.py's cases under pytest-benchmark, for its statistics, histograms and --benchmark-compare.
+
+Skipped unless pytest-benchmark is installed. Run from the repository root:
+    python -m pytest benchmarks/test_bench_pipeline.py --benchmark-autosave
+    python -m pytest benchmarks/test_bench_pipeline.py --benchmark-compare --benchmark-compare-fail=min:50%
+"""
+import contextlib
+import io
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+import metrics
+from bench_pipeline import cases
+
+CASES = ["build_site cold", "build_site warm", "sitemap walk", "scrape_latest", "scrape_by_id", "analyze_patterns"]
+ROUNDS = 15
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    return {name: (run, setup) for name, run, setup, _ in cases()}
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_pipeline(benchmark, pipeline, name):
+    run, setup = pipeline[name]
+    # Each round gets a fresh setup (a cold site is only cold once); the previous one is torn down first
+    stack = contextlib.ExitStack()
+
+    def fresh_setup():
+        stack.close()
+        if setup:
+            with metrics.use(None):
+                stack.enter_context(setup())
+
+    def quiet_run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            run()
+
+    try:
+        benchmark.pedantic(quiet_run, setup=fresh_setup, rounds=ROUNDS)
+    finally:
+        stack.close()
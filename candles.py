@@ -0,0 +1,111 @@
+"""NumPy candlestick patterns for collect_data.py: engulfing, doji and hammer.
+
+Each detector reproduces what `df.ta.cdl_pattern(name=["engulfing", "doji", "hammer"])`
+returns: pandas_ta's own doji (CDL_DOJI_10_0.1) and TA-Lib's CDLENGULFING and CDLHAMMER
+(which pandas_ta calls when TA-Lib is installed). Values are 100 / -100 (80 / -80 for an
+engulfing that only touches the previous body), or 0.
+
+collect_data.py only needs the newest bar, so last_patterns() looks at the last LOOKBACK
+bars, and PatternEngine keeps just those bars and evaluates each newly closed one.
+"""
+import sys
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# --- CONFIGURATION ---
+DOJI_LENGTH = 10         # pandas_ta: bars in the high-low range average
+DOJI_FACTOR = 10         # pandas_ta: body below 10% of that average
+BODY_SHORT_PERIOD = 10   # TA-Lib candle settings used by CDLHAMMER
+SHADOW_VERY_SHORT_PERIOD = 10
+SHADOW_VERY_SHORT_FACTOR = 0.1
+NEAR_PERIOD = 5
+NEAR_FACTOR = 0.2
+HAMMER_LOOKBACK = max(BODY_SHORT_PERIOD, SHADOW_VERY_SHORT_PERIOD, NEAR_PERIOD) + 1  # TA-Lib's first output
+LOOKBACK = HAMMER_LOOKBACK + 1  # Bars the slowest detector needs for the newest one
+
+COLUMNS = {"engulfing": "CDL_ENGULFING", "doji": f"CDL_DOJI_{DOJI_LENGTH}_{0.01 * DOJI_FACTOR}",
+           "hammer": "CDL_HAMMER"}
+
+def _trailing_mean(values, period):
+    """mean(values[i - period:i]) at every i >= period (the bars before i), NaN before that."""
+    out = np.full(len(values), np.nan)
+    if len(values) > period:
+        out[period:] = sliding_window_view(values, period)[:-1].mean(axis=1)
+    return out
+
+def _non_zero_range(a, b):
+    # pandas_ta nudges a whole difference series by epsilon when any element is zero
+    diff = a - b
+    return diff + sys.float_info.epsilon if (diff == 0).any() else diff
+
+def engulfing(open_, high, low, close):
+    """TA-Lib CDLENGULFING."""
+    out = np.zeros(len(close), dtype=int)
+    if len(close) < 2:
+        return out
+    color = np.where(close >= open_, 1, -1)
+    o, c, po, pc = open_[1:], close[1:], open_[:-1], close[:-1]
+    white = (color[1:] == 1) & (color[:-1] == -1) & (((c >= po) & (o < pc)) | ((c > po) & (o <= pc)))
+    black = (color[1:] == -1) & (color[:-1] == 1) & (((o >= pc) & (c < po)) | ((o > pc) & (c <= po)))
+    strength = np.where((o != pc) & (c != po), 100, 80)
+    out[1:] = np.where(white | black, color[1:] * strength, 0)
+    return out
+
+def doji(open_, high, low, close, length=DOJI_LENGTH, factor=DOJI_FACTOR):
+    """pandas_ta cdl_doji: body under factor% of the average high-low range of the last `length` bars."""
+    out = np.zeros(len(close), dtype=int)
+    if len(close) < length:
+        return out
+    body = np.abs(_non_zero_range(close, open_))
+    hl_avg = sliding_window_view(np.abs(_non_zero_range(high, low)), length).mean(axis=1)
+    out[length - 1:] = np.where(body[length - 1:] < 0.01 * factor * hl_avg, 100, 0)
+    return out
+
+def hammer(open_, high, low, close):
+    """TA-Lib CDLHAMMER: small body, lower shadow longer than the body, almost no upper
+    shadow, and the body at or near the previous bar's low."""
+    out = np.zeros(len(close), dtype=int)
+    if len(close) <= HAMMER_LOOKBACK:
+        return out
+    body = np.abs(close - open_)
+    hl_range = high - low
+    body_low = np.minimum(open_, close)
+    upper_shadow = high - np.maximum(open_, close)
+    lower_shadow = body_low - low
+
+    body_avg = _trailing_mean(body, BODY_SHORT_PERIOD)
+    shadow_avg = SHADOW_VERY_SHORT_FACTOR * _trailing_mean(hl_range, SHADOW_VERY_SHORT_PERIOD)
+    near = np.full(len(close), np.nan)
+    near[1:] = NEAR_FACTOR * _trailing_mean(hl_range, NEAR_PERIOD)[:-1]  # measured at the previous bar
+    prev_low = np.concatenate(([np.nan], low[:-1]))
+
+    i = slice(HAMMER_LOOKBACK, None)
+    found = ((body[i] < body_avg[i]) & (lower_shadow[i] > body[i]) & (upper_shadow[i] < shadow_avg[i])
+             & (body_low[i] <= prev_low[i] + near[i]))
+    out[i] = np.where(found, 100, 0)
+    return out
+
+DETECTORS = {"engulfing": engulfing, "doji": doji, "hammer": hammer}
+
+def detect(open_, high, low, close):
+    """{pattern: int array} over every bar, like cdl_pattern's columns."""
+    bars = [np.asarray(x, dtype=float) for x in (open_, high, low, close)]
+    return {name: fn(*bars) for name, fn in DETECTORS.items()}
+
+def last_patterns(open_, high, low, close):
+    """{pattern: value} for the newest bar, computed from the last LOOKBACK bars only."""
+    bars = [np.asarray(x[-LOOKBACK:], dtype=float) for x in (open_, high, low, close)]
+    return {name: int(fn(*bars)[-1]) for name, fn in DETECTORS.items()}
+
+class PatternEngine:
+    """Feeds closed bars one at a time and keeps only the last LOOKBACK of them."""
+
+    def __init__(self):
+        self.bars = deque(maxlen=LOOKBACK)
+
+    def update(self, open_, high, low, close):
+        """Adds a closed bar and returns {pattern: value} for it."""
+        self.bars.append((open_, high, low, close))
+        return last_patterns(*np.array(self.bars).T)
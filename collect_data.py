@@ -1,58 +1,172 @@
-import json
+import argparse
 import os
-import pandas as pd
-import pandas_ta as ta
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FetchTimeout
 from datetime import datetime
+import metrics
+from value_store import ValueStore
 
-# Handle case-sensitivity in the tvDatafeed library
-try:
-    from tvDatafeed import TvDatafeed, Interval
-except ImportError:
-    from tvdatafeed import TvDatafeed, Interval
+# pandas, NumPy and tvDatafeed are imported on first use, so importing this module (from
+# scheduler.py, or for --help) stays cheap and has no side effects.
 
-# 1. Setup Data Directory
+# 1. Data files
 folder_path = 'data'
 file_path = os.path.join(folder_path, 'value.json')
-os.makedirs(folder_path, exist_ok=True)
+store_path = os.path.join(folder_path, 'value')
 
-# 2. Initialize TradingView (Guest Mode)
-tv = TvDatafeed()
+# 2. TradingView (Guest Mode). A TvDatafeed keeps its websocket on the instance,
+# so every fetch thread gets its own client.
+SYMBOL = 'XAUUSD'
+EXCHANGE = 'OANDA'
+N_BARS = 50          # Enough bars for pattern analysis
+FETCH_TIMEOUT = 20   # Seconds to wait for each timeframe
+EXPORT_EVERY = 3600  # Seconds between value.json exports with --export-every
+
+# label: (tvDatafeed Interval member, minutes)
+TIMEFRAMES = {
+    "15m": ("in_15_minute", 15),
+    "30m": ("in_30_minute", 30),
+    "45m": ("in_45_minute", 45),
+    "1h": ("in_1_hour", 60)
+}
+
+_local = threading.local()
+
+def tvdatafeed():
+    # Handle case-sensitivity in the tvDatafeed library
+    try:
+        import tvDatafeed
+    except ImportError:
+        import tvdatafeed as tvDatafeed
+    return tvDatafeed
+
+def get_tv():
+    if not hasattr(_local, 'tv'):
+        _local.tv = tvdatafeed().TvDatafeed()
+    return _local.tv
+
+def fetch_bars(interval, n_bars=N_BARS):
+    tv_interval = getattr(tvdatafeed().Interval, interval)
+    with metrics.stage("network"):
+        df = get_tv().get_hist(symbol=SYMBOL, exchange=EXCHANGE, interval=tv_interval, n_bars=n_bars)
+    metrics.count("requests")
+    metrics.count("bars_fetched", 0 if df is None else len(df))
+    return df
+
+def fetch_new_bars(store, label, n_bars):
+    """The last n_bars of a timeframe, fetching upstream only what the bar store is missing."""
+    import pandas as pd
+    interval, minutes = TIMEFRAMES[label]
+    bars = store.update(EXCHANGE, SYMBOL, label, minutes, lambda n: fetch_bars(interval, n), n_bars)
+    if len(bars) == 0:
+        return None
+    index = pd.to_datetime(bars['time'], unit='s').rename('datetime')
+    return pd.DataFrame({name: bars[name] for name in bars.dtype.names[1:]}, index=index)
+
+def backfill(n_bars):
+    from bar_store import BarStore
+    store = BarStore()
+    for label, (interval, _) in TIMEFRAMES.items():
+        added = store.backfill(EXCHANGE, SYMBOL, label, lambda n: fetch_bars(interval, n), n_bars)
+        print(f"Backfilled {label}: {added} new bars")
+
+def resample_bars(df, minutes):
+    """Builds `minutes` candles from lower-timeframe OHLCV bars, aligned to midnight like TradingView."""
+    bars = df.resample(f"{minutes}min", origin='start_day', label='left', closed='left').agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'})
+    return bars.dropna(subset=['open'])
+
+def run_in_daemon(fn, *args):
+    """Runs fn(*args) on a daemon thread and returns a Future for its result.
+
+    A TvDatafeed call can block on its websocket for as long as the server holds it. Daemon
+    threads are not joined at exit, so a timed-out fetch cannot keep the run alive after
+    FETCH_TIMEOUT (pool threads are joined, even after shutdown(wait=False)).
+    """
+    future = Future()
+
+    def target():
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+    threading.Thread(target=metrics.bind(target), daemon=True).start()
+    return future
+
+def fetch_timeframes(resample=False, timeout=FETCH_TIMEOUT):
+    """Returns {label: DataFrame or None}. Each failed timeframe is printed once, here.
+
+    By default every timeframe is fetched concurrently. With resample=True only the lowest
+    timeframe is fetched, with enough bars to rebuild the higher ones locally. Either way only
+    bars newer than those in the local bar store are requested.
+    """
+    from bar_store import BarStore
+    store = BarStore()
+    base_label, (_, base_minutes) = min(TIMEFRAMES.items(), key=lambda item: item[1][1])
+    if resample:
+        widest = max(minutes for _, minutes in TIMEFRAMES.values())
+        jobs = {base_label: N_BARS * widest // base_minutes + widest // base_minutes}
+    else:
+        jobs = {label: N_BARS for label in TIMEFRAMES}
+
+    futures = {label: run_in_daemon(fetch_new_bars, store, label, n_bars) for label, n_bars in jobs.items()}
+    # All timeframes share one deadline, so a stalled fetch cannot stack its timeout onto the others
+    deadline = time.monotonic() + timeout
+    frames = {}
+    for label, future in futures.items():
+        error = None
+        try:
+            frames[label] = future.result(timeout=max(0, deadline - time.monotonic()))
+            if frames[label] is None or frames[label].empty:
+                error = "no data returned"
+        except FetchTimeout:
+            error = f"timed out after {timeout}s"
+        except Exception as e:
+            error = e
+        if error:
+            print(f"Error fetching {label}: {error}")
+            metrics.count("timeframes_failed")
+            frames[label] = None
+
+    if resample:
+        base = frames[base_label]
+        if base is None:
+            print(f"Skipping {', '.join(label for label in TIMEFRAMES if label != base_label)}: "
+                  f"they are resampled from {base_label}")
+        for label, (_, minutes) in TIMEFRAMES.items():
+            if label == base_label or base is None:
+                frames[label] = base
+            else:
+                frames[label] = resample_bars(base, minutes).tail(N_BARS)
+        if base is not None:
+            frames[base_label] = base.tail(N_BARS)
+    return frames
 
 def analyze_patterns(df):
     """Detects patterns and returns name + explanation"""
-    # Standardize column names for pandas_ta (needs open, high, low, close)
+    from candles import last_patterns
     df.columns = [x.lower() for x in df.columns]
     
-    # Calculate Candlestick Patterns
-    # cdl_pattern returns a DataFrame where values are 100 (Bullish), -100 (Bearish), or 0
-    patterns = df.ta.cdl_pattern(name=["engulfing", "doji", "hammer"])
-    
-    if patterns is None or patterns.empty:
-        return "Normal", "Steady market movement with no specific candle formation."
-
-    last_row = patterns.iloc[-1]
+    # Only the newest bar matters; values are 100 (Bullish), -100 (Bearish), or 0
+    last_row = last_patterns(df['open'].values, df['high'].values, df['low'].values, df['close'].values)
     
     # Pattern Logic
-    if last_row.get('CDL_ENGULFING', 0) != 0:
-        res = "Bullish Engulfing" if last_row['CDL_ENGULFING'] > 0 else "Bearish Engulfing"
+    if last_row['engulfing'] != 0:
+        res = "Bullish Engulfing" if last_row['engulfing'] > 0 else "Bearish Engulfing"
         return res, "The current candle body fully consumes the previous one, suggesting a strong trend reversal."
     
-    if last_row.get('CDL_DOJI_10_0.1', 0) != 0:
+    if last_row['doji'] != 0:
         return "Doji", "Indicates market indecision: the opening and closing prices are nearly equal."
     
-    if last_row.get('CDL_HAMMER', 0) != 0:
+    if last_row['hammer'] != 0:
         return "Hammer", "A bullish reversal pattern showing buyers pushed price back up after a drop."
     
     return "Normal", "No significant candlestick pattern identified in this timeframe."
 
-def update_json():
-    intervals = {
-        "15m": Interval.in_15_minute,
-        "30m": Interval.in_30_minute,
-        "45m": Interval.in_45_minute,
-        "1h": Interval.in_1_hour
-    }
-    
+def update_json(export=False, resample=False, export_every=None):
+    """Appends one tick to the store. value.json is rewritten when `export` is set, or when the
+    last export is more than `export_every` seconds old."""
     # Current timestamp for recording
     now = datetime.now()
     timestamp_str = now.strftime("%Y-%m-%d %H:%M")
@@ -60,45 +174,58 @@ def update_json():
 
     print(f"Fetching data for {timestamp_str}...")
 
-    for label, tv_interval in intervals.items():
+    with metrics.stage("fetch"):
+        frames = fetch_timeframes(resample=resample)
+
+    for label, df in frames.items():
+        if df is None:
+            continue  # Already reported by fetch_timeframes()
         try:
-            # Fetch 50 bars to ensure enough data for pattern analysis
-            df = tv.get_hist(symbol='XAUUSD', exchange='OANDA', interval=tv_interval, n_bars=50)
-            
-            if df is not None and not df.empty:
+            with metrics.stage("patterns"):
                 pattern, desc = analyze_patterns(df)
-                new_entry["data"][label] = {
-                    "price": round(df['close'].iloc[-1], 2),
-                    "pattern": pattern,
-                    "explanation": desc
-                }
-            else:
-                print(f"Warning: No data returned for {label}")
+            new_entry["data"][label] = {
+                "price": round(df['close'].iloc[-1], 2),
+                "pattern": pattern,
+                "explanation": desc
+            }
         except Exception as e:
-            print(f"Error fetching {label}: {e}")
-
-    # 3. Load, Append, and Save
-    full_history = []
-    if os.path.exists(file_path):
-        with open(file_path, 'r') as f:
-            try:
-                full_history = json.load(f)
-            except json.JSONDecodeError:
-                full_history = []
-
-    # Check for duplicate timestamp to prevent double-entries
-    if not any(d.get('timestamp') == timestamp_str for d in full_history):
-        full_history.append(new_entry)
-        
-        # Keep only last 1000 records to keep file size small
-        if len(full_history) > 1000:
-            full_history = full_history[-1000:]
-
-        with open(file_path, 'w') as f:
-            json.dump(full_history, f, indent=4)
-        print("Successfully updated data/value.json")
+            print(f"Error analyzing {label}: {e}")
+            metrics.count("timeframes_failed")
+
+    # 3. Append to the store; only the new entry is written
+    with metrics.stage("write"):
+        store = ValueStore(store_path)
+        if len(store) == 0:
+            # First run on the store: carry over the existing history
+            store.import_json(file_path)
+
+        if store.append(new_entry):
+            print(f"Successfully appended to {store_path}/")
+            metrics.count("entries_written")
+        else:
+            print("Data for this timestamp already exists. Skipping.")
+
+        if export or (export_every is not None and store.export_due(export_every)):
+            store.export(file_path)
+            print(f"Exported {file_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect XAUUSD prices and candlestick patterns.")
+    parser.add_argument("--export", action="store_true", help="Also rewrite data/value.json from the store")
+    parser.add_argument("--export-every", type=int, nargs="?", const=EXPORT_EVERY, metavar="SECONDS",
+                        help=f"Rewrite data/value.json when the last export is older than this (default {EXPORT_EVERY})")
+    parser.add_argument("--resample", action="store_true",
+                        help="Fetch only the 15m bars and build the higher timeframes locally")
+    parser.add_argument("--backfill", type=int, metavar="N",
+                        help="Fill the local bar store with the last N bars of every timeframe and exit")
+    args = parser.parse_args()
+    report = metrics.start("xauusd")
+    if args.backfill:
+        backfill(args.backfill)
     else:
-        print("Data for this timestamp already exists. Skipping.")
+        update_json(export=args.export, resample=args.resample, export_every=args.export_every)
+    report.save()
+    print(report.summary())
 
 if __name__ == "__main__":
-    update_json()
+    main()
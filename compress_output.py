@@ -0,0 +1,100 @@
+import argparse
+import gzip
+import hashlib
+import os
+
+from json_files import read_json, write_json
+
+# Brotli is optional: without it only .gz siblings are written
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# --- CONFIGURATION ---
+MANIFEST_FILE = ".build/compress_manifest.json"  # sha256 of each source when it was last compressed
+EXTENSIONS = (".html", ".xml", ".css", ".js", ".json")
+
+def write_bytes(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+def compress_files(paths, force=False):
+    """Writes .gz (and .br when brotli is installed) siblings for every path.
+
+    Files whose source hash matches the manifest and whose siblings already exist are skipped.
+    Without brotli, a changed file's old .br sibling is deleted rather than left stale.
+    Returns counters including total source and compressed byte sizes.
+    """
+    manifest = read_json(MANIFEST_FILE)
+    old_manifest = dict(manifest)
+    stats = {"files": 0, "compressed": 0, "skipped": 0, "source_bytes": 0, "gz_bytes": 0, "br_bytes": 0, "br_removed": 0}
+
+    for path in sorted(set(p.replace(os.sep, "/") for p in paths)):
+        if not os.path.exists(path):
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        stats["files"] += 1
+        stats["source_bytes"] += len(data)
+
+        siblings = [path + ".gz"] + ([path + ".br"] if brotli else [])
+        if not force and manifest.get(path) == digest and all(os.path.exists(s) for s in siblings):
+            stats["skipped"] += 1
+            stats["gz_bytes"] += os.path.getsize(path + ".gz")
+            if brotli:
+                stats["br_bytes"] += os.path.getsize(path + ".br")
+            continue
+
+        # mtime=0 keeps the gzip output byte-identical for identical input
+        gz_data = gzip.compress(data, compresslevel=9, mtime=0)
+        write_bytes(path + ".gz", gz_data)
+        stats["gz_bytes"] += len(gz_data)
+        if brotli:
+            br_data = brotli.compress(data, quality=11)
+            write_bytes(path + ".br", br_data)
+            stats["br_bytes"] += len(br_data)
+        elif os.path.exists(path + ".br"):
+            # Left by a run that had brotli: it no longer matches the source, so don't let it be served
+            os.remove(path + ".br")
+            stats["br_removed"] += 1
+
+        manifest[path] = digest
+        stats["compressed"] += 1
+
+    if manifest != old_manifest:
+        write_json(MANIFEST_FILE, manifest, sort_keys=True)
+
+    print_report(stats)
+    return stats
+
+def print_report(stats):
+    if not stats["source_bytes"]:
+        print("Compression: no files to compress.")
+        return
+    line = (f"Compression: {stats['files']} files ({stats['compressed']} recompressed, {stats['skipped']} unchanged). "
+            f"{stats['source_bytes']:,} bytes -> gzip {stats['gz_bytes']:,} ({stats['gz_bytes'] / stats['source_bytes']:.1%})")
+    if brotli:
+        line += f", brotli {stats['br_bytes']:,} ({stats['br_bytes'] / stats['source_bytes']:.1%})"
+    elif stats["br_removed"]:
+        line += f"; brotli not installed, removed {stats['br_removed']} stale .br files"
+    print(line + ".")
+
+def find_files(targets):
+    """Expands directories into the compressible files they contain."""
+    paths = []
+    for target in targets:
+        if os.path.isdir(target):
+            for root, dirs, files in os.walk(target):
+                paths.extend(os.path.join(root, f) for f in files if f.endswith(EXTENSIONS))
+        else:
+            paths.append(target)
+    return paths
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write pre-compressed .gz/.br siblings for generated files.")
+    parser.add_argument("targets", nargs="+", help="Files or directories to compress.")
+    parser.add_argument("--force", action="store_true", help="Recompress even if the source is unchanged.")
+    args = parser.parse_args()
+    compress_files(find_files(args.targets), force=args.force)
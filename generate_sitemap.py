@@ -1,42 +1,177 @@
+import argparse
+import hashlib
 import os
+import re
 from datetime import datetime
 from urllib.parse import urljoin
 
+import metrics
+from json_files import read_json, write_json
+
 # ================= CONFIG =================
 BASE_URL = "https://today.singhyogendra.com.np/"  # change this
 OUTPUT_FILE = "sitemap.xml"
-EXCLUDE_DIRS = {".git", ".github", "node_modules", "__pycache__"}
+MANIFEST_FILE = ".build/sitemap_manifest.json"  # content hash and lastmod of every page
+SITE_CONTENT_FILE = ".build/site_content.json"  # 100.py's date-independent hash of each page it builds
+STAT_FILE = ".build/sitemap_stat.json"  # size/mtime of each hashed page; local only, CI checkouts reset mtimes
+EXCLUDE_DIRS = {".git", ".github", ".build", "node_modules", "__pycache__",
+                "assets"}  # 100.py --split-assets output: shared CSS/JS and the counter iframe, not pages
+MAX_URLS = 45000  # Split into a sitemap index before reaching the protocol's 50,000 limit
+# Parts of a page that change on every rebuild without the content changing
+VOLATILE_PATTERNS = [re.compile(rb' data-built="[^"]*"')]
 # ==========================================
 
-urls = []
+def find_pages():
+    for root, dirs, files in os.walk("."):
+        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+        for file in files:
+            if file.endswith(".html"):
+                yield os.path.join(root, file).replace("\\", "/")[2:]
+
+def page_hash(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    for pattern in VOLATILE_PATTERNS:
+        data = pattern.sub(b"", data)
+    return hashlib.sha256(data).hexdigest()
+
+def update_pages(manifest, today, site_keys=None, stats=None):
+    """Refreshes manifest["pages"]; lastmod only moves when a page's content hash changes.
+
+    Pages 100.py built use its date-independent key (site_keys), so a rebuild that only moved
+    the countdowns keeps their lastmod and their files are never read. Other pages are hashed,
+    unless their size and mtime match `stats` ({path: [size, mtime_ns, hash]}), which is
+    updated in place.
+    """
+    site_keys = site_keys or {}
+    stats = {} if stats is None else stats
+    old_pages = manifest["pages"]
+    pages, changed, seen = {}, 0, set()
+    for path in find_pages():
+        seen.add(path)
+        entry = old_pages.get(path)
+        digest = site_keys.get(path)
+        if digest is None:
+            st = os.stat(path)
+            cached = stats.get(path)
+            if cached and cached[:2] == [st.st_size, st.st_mtime_ns]:
+                digest = cached[2]
+            else:
+                digest = page_hash(path)
+                stats[path] = [st.st_size, st.st_mtime_ns, digest]
+        elif entry and entry["sha256"] != digest and entry["sha256"] == page_hash(path):
+            # Hashed before 100.py recorded keys: the page itself is unchanged, only its key is new
+            entry = dict(entry, sha256=digest)
+        if not entry or entry["sha256"] != digest:
+            entry = {"sha256": digest, "lastmod": today}
+            changed += 1
+        pages[path] = entry
+    for path in set(stats) - seen:
+        del stats[path]
+    manifest["pages"] = pages
+    return changed, len(set(old_pages) - set(pages))
+
+def page_url(path):
+    if path.endswith("index.html"):
+        path = path[:-len("index.html")]
+    return urljoin(BASE_URL, path)
+
+def shard_key(path):
+    """Pages are grouped by folder and by the year their file name starts with, so a
+    shard only changes when pages in its own folder and year do."""
+    folder, name = os.path.split(path)
+    key = folder.replace("/", "-") or "root"
+    year = re.match(r"\d{4}", name)
+    return f"{key}-{year.group()}" if year else key
+
+def render_urlset(entries):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for url, lastmod in entries:
+        lines += ["  <url>",
+                  f"    <loc>{url}</loc>",
+                  f"    <lastmod>{lastmod}</lastmod>",
+                  "    <changefreq>daily</changefreq>",
+                  "    <priority>0.8</priority>",
+                  "  </url>"]
+    return "\n".join(lines) + "\n</urlset>"
+
+def render_index(shards):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for name, lastmod in shards:
+        lines += ["  <sitemap>",
+                  f"    <loc>{urljoin(BASE_URL, name)}</loc>",
+                  f"    <lastmod>{lastmod}</lastmod>",
+                  "  </sitemap>"]
+    return "\n".join(lines) + "\n</sitemapindex>"
 
-for root, dirs, files in os.walk("."):
-    dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+def write_if_changed(path, content):
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return True
 
-    for file in files:
-        if file.endswith(".html"):
-            full_path = os.path.join(root, file)
-            url_path = full_path.replace("./", "").replace("\\", "/")
+def build_files(pages, max_urls=MAX_URLS):
+    """{file name: content}: a single sitemap.xml, or an index plus one file per shard."""
+    entries = sorted({page_url(path): entry["lastmod"] for path, entry in pages.items()}.items())
+    if len(entries) <= max_urls:
+        return {OUTPUT_FILE: render_urlset(entries)}
 
-            if url_path.endswith("index.html"):
-                url_path = url_path.replace("index.html", "")
+    groups = {}
+    for path, entry in pages.items():
+        groups.setdefault(shard_key(path), {})[page_url(path)] = entry["lastmod"]
+    files, index = {}, []
+    stem = OUTPUT_FILE.rsplit(".", 1)[0]
+    for key in sorted(groups):
+        group = sorted(groups[key].items())
+        chunks = [group[i:i + max_urls] for i in range(0, len(group), max_urls)]
+        for n, chunk in enumerate(chunks, 1):
+            name = f"{stem}-{key}.xml" if len(chunks) == 1 else f"{stem}-{key}-{n}.xml"
+            files[name] = render_urlset(chunk)
+            index.append((name, max(lastmod for _, lastmod in chunk)))
+    files[OUTPUT_FILE] = render_index(index)
+    return files
 
-            urls.append(urljoin(BASE_URL, url_path))
+def generate(compress=False):
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+    manifest = read_json(MANIFEST_FILE, {"pages": {}, "shards": []})
+    stats = read_json(STAT_FILE)
+    with metrics.stage("walk"):
+        changed, removed = update_pages(manifest, today, read_json(SITE_CONTENT_FILE), stats)
 
-now = datetime.utcnow().strftime("%Y-%m-%d")
+    with metrics.stage("render"):
+        files = build_files(manifest["pages"])
+    with metrics.stage("write"):
+        written = [name for name, content in files.items() if write_if_changed(name, content)]
+        for name in set(manifest.get("shards", [])) - set(files):
+            if os.path.exists(name):
+                os.remove(name)
+        manifest["shards"] = sorted(name for name in files if name != OUTPUT_FILE)
+        write_json(MANIFEST_FILE, manifest, sort_keys=True)
+        write_json(STAT_FILE, stats, indent=None)
+    metrics.count("pages", len(manifest["pages"]))
+    metrics.count("pages_changed", changed)
+    metrics.count("files_written", len(written))
 
-with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-    f.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+    print(f"✅ sitemap: {len(manifest['pages'])} pages ({changed} new or changed, {removed} removed), "
+          f"{len(written)} of {len(files)} files rewritten")
 
-    for url in sorted(set(urls)):
-        f.write("  <url>\n")
-        f.write(f"    <loc>{url}</loc>\n")
-        f.write(f"    <lastmod>{now}</lastmod>\n")
-        f.write("    <changefreq>daily</changefreq>\n")
-        f.write("    <priority>0.8</priority>\n")
-        f.write("  </url>\n")
+    if compress:
+        from compress_output import compress_files
+        compress_files(list(files))
 
-    f.write("</urlset>")
+def main():
+    parser = argparse.ArgumentParser(description="Generate sitemap.xml for every .html page in the repo.")
+    parser.add_argument("--compress", action="store_true", help="Also write .gz/.br siblings of sitemap.xml.")
+    args = parser.parse_args()
+    report = metrics.start("sitemap")
+    generate(compress=args.compress)
+    report.save()
+    print(report.summary())
 
-print("✅ sitemap.xml generated successfully!")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Atomic JSON files: the manifests, indexes, caches and checkpoints the scripts keep between runs.
+
+Every write goes to a temporary file next to the target and is renamed over it with
+os.replace(), so a crash or a killed CI step never leaves a truncated file behind; readers see
+the old content or the new, nothing in between.
+"""
+import json
+import os
+import threading
+
+def read_json(path, default=None):
+    """The JSON in path, or `default` ({} unless given) when the file is missing or unreadable."""
+    if default is None:
+        default = {}
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            return default
+
+def write_text(path, content):
+    """Writes content to path through a temporary file and os.replace(), creating parent folders."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Per process and thread, so concurrent writers of the same path never share a temp file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def write_json(path, data, indent=1, sort_keys=False, separators=None):
+    """Writes data as JSON, atomically (see write_text)."""
+    write_text(path, json.dumps(data, indent=indent, sort_keys=sort_keys, separators=separators))
@@ -0,0 +1,138 @@
+"""Per-run stage timings, counters and peak memory for the pipeline scripts, saved as JSON.
+
+    report = metrics.start("site")
+    with metrics.stage("render"):
+        ...
+    metrics.count("pages_written", 12)
+    report.save()   # .build/metrics/site.json, plus a line in .build/metrics/history.jsonl
+
+stage() and count() record into the report started on the calling thread. Helper threads
+(fetch workers, sweep shards) have none of their own: the code that hands them work wraps it
+with bind(), which carries the submitting thread's report along, so two runs sharing a process
+(the scheduler's batch and latest jobs) never count into each other. Without a report they do
+nothing, so modules can be instrumented unconditionally. Stage seconds are summed across
+threads, so concurrent stages (network) can exceed the run's wall time.
+
+Reports are not committed (.build/metrics/ is gitignored); the workflows upload them as artifacts.
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from json_files import write_json
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# --- CONFIGURATION ---
+REPORT_DIR = ".build/metrics"
+HISTORY_FILE = "history.jsonl"
+
+_local = threading.local()
+
+def peak_memory_mb():
+    """Peak resident memory of this process so far, or None where the platform doesn't report it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+class Report:
+    def __init__(self, name):
+        self.name = name
+        self.started = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.start_time = time.perf_counter()
+        self.stages = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def add_time(self, stage, seconds):
+        with self.lock:
+            entry = self.stages.setdefault(stage, {"seconds": 0.0, "calls": 0})
+            entry["seconds"] += seconds
+            entry["calls"] += 1
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                "name": self.name,
+                "started": self.started,
+                "seconds": round(time.perf_counter() - self.start_time, 4),
+                "stages": {name: {"seconds": round(s["seconds"], 4), "calls": s["calls"]}
+                           for name, s in self.stages.items()},
+                "counters": dict(self.counters),
+                "peak_memory_mb": peak_memory_mb(),
+            }
+
+    def summary(self):
+        """One line: total time, then each stage's share."""
+        report = self.to_dict()
+        stages = ", ".join(f"{name} {s['seconds']:.2f}s" for name, s in
+                           sorted(report["stages"].items(), key=lambda item: -item[1]["seconds"]))
+        return f"{self.name}: {report['seconds']:.2f}s ({stages or 'no stages'})"
+
+    def save(self, directory=REPORT_DIR):
+        """Writes <directory>/<name>.json and appends the same report to the history file."""
+        report = self.to_dict()
+        path = os.path.join(directory, f"{self.name}.json")
+        write_json(path, report)
+        with open(os.path.join(directory, HISTORY_FILE), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(report) + "\n")
+        return path
+
+def start(name):
+    """Starts a report for this thread's run."""
+    report = _local.report = Report(name)
+    return report
+
+def current():
+    return getattr(_local, "report", None)
+
+@contextmanager
+def use(report):
+    """Records this thread's stage() and count() calls into `report` for the block."""
+    previous = current()
+    _local.report = report
+    try:
+        yield report
+    finally:
+        _local.report = previous
+
+def bind(fn):
+    """Wraps fn so that, on whichever thread it runs, it records into the report current here."""
+    report = current()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with use(report):
+            return fn(*args, **kwargs)
+    return wrapper
+
+@contextmanager
+def stage(name):
+    report = current()
+    if report is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        report.add_time(name, time.perf_counter() - start_time)
+
+def count(name, n=1):
+    report = current()
+    if report is not None:
+        report.count(name, n)
@@ -0,0 +1,240 @@
+"""BS <-> AD conversion tables compiled from the date/*.json calendar files.
+
+DateTable keeps one slot per AD day from the first to the last date in the calendars, in
+`array` columns indexed by date.toordinal() - first: the BS date packed as YYYYMMDD, the event
+id and the month record index. BS -> AD uses a second array with a fixed 32-day slot per BS
+month. Both directions, the weekday and the event of a day are O(1); range and upcoming-event
+queries bisect a sorted array of the days that have events.
+
+to_bytes() / to_json() export the same table compactly for the pages or other tools.
+
+Usage:
+    python nepali_calendar.py 2026-03-15                # AD -> BS
+    python nepali_calendar.py 2082-12-01                # BS -> AD (BS years are > 2070)
+    python nepali_calendar.py --export-json nepali-date/dates.json --export-bin nepali-date/dates.bin
+"""
+import argparse
+import bisect
+import json
+import os
+import struct
+import sys
+from array import array
+from datetime import date
+
+# --- CONFIGURATION ---
+JSON_FILES = ["date/2026.json", "date/2027.json", "date/202602.json"]
+BS_MONTH_SLOTS = 32  # No BS month is longer than 32 days
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+BINARY_MAGIC = b"NPCL"
+BINARY_HEADER = struct.Struct("<4sHiiI")  # magic, version, first AD ordinal, first BS year, days
+
+def read_calendar_months(json_files):
+    """Yields (ad_month, ad_year, bs_months, days) for every month in the given calendar files.
+
+    Accepts both the yearly {"year", "calendar_data"} layout and the single-month
+    {"month_info", "days"} layout.
+    """
+    for path in json_files:
+        if not os.path.exists(path):
+            print(f"Error: {path} not found.")
+            continue
+
+        with open(path, 'r', encoding='utf-8') as f:
+            content = json.load(f)
+            data = content[0] if isinstance(content, list) else content
+
+        if 'calendar_data' in data:
+            for m in data['calendar_data']:
+                yield m['month'], m.get('ad_year', data.get('year', '')), m['bs_months'], m['days']
+        else:
+            info = data['month_info']
+            yield info['ad_month'], info['ad_year'], info['bs_months'], data['days']
+
+def pack_bs(bs):
+    year, month, day = (int(part) for part in bs.split('-'))
+    return year * 10000 + month * 100 + day
+
+def unpack_bs(packed):
+    return f"{packed // 10000:04d}-{packed // 100 % 100:02d}-{packed % 100:02d}"
+
+def to_ordinal(value):
+    """An AD date given as a date, an ordinal, or a 'YYYY-MM-DD' string, as date.toordinal()."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal()
+
+class DateTable:
+    def __init__(self, first, bs, event_ids, month_ids, events):
+        self.first = first
+        self.bs = bs                # array('I'): packed BS date per AD day, 0 if unknown
+        self.event_ids = event_ids  # array('i'): index into events, -1 for none
+        self.month_ids = month_ids  # array('i'): index of the month record, -1 if unknown
+        self.events = events
+        self.event_days = array('i', (i for i, e in enumerate(event_ids) if e >= 0))
+        self.event_rows = [self._event(offset) for offset in self.event_days]
+
+        known = [packed for packed in bs if packed]
+        self.bs_first_year = min(known) // 10000 if known else 0
+        years = max(known) // 10000 - self.bs_first_year + 1 if known else 0
+        self.ad_by_bs = array('i', [-1]) * (years * 12 * BS_MONTH_SLOTS)
+        for offset, packed in enumerate(bs):
+            if packed:
+                self.ad_by_bs[self._bs_slot(packed)] = offset
+
+    @classmethod
+    def from_days(cls, days, month_ids=None):
+        """Builds the table from day dicts ({"ad", "bs", "event"}); the first dict for an AD date wins."""
+        rows = {}
+        for i, d in enumerate(days):
+            rows.setdefault(to_ordinal(d['ad']), (d, month_ids[i] if month_ids else -1))
+        if not rows:
+            return cls(0, array('I'), array('i'), array('i'), [])
+
+        first = min(rows)
+        size = max(rows) - first + 1
+        bs, event_ids, months = array('I', [0]) * size, array('i', [-1]) * size, array('i', [-1]) * size
+        events = []
+        for ordinal, (d, month_id) in rows.items():
+            offset = ordinal - first
+            bs[offset] = pack_bs(d['bs'])
+            months[offset] = month_id
+            if d.get('event'):
+                event_ids[offset] = len(events)
+                events.append(d['event'])
+        return cls(first, bs, event_ids, months, events)
+
+    @classmethod
+    def from_months(cls, months):
+        """Builds the table from 100.py's month records, remembering each day's month index."""
+        days = [d for m in months for d in m['days']]
+        month_ids = [i for i, m in enumerate(months) for _ in m['days']]
+        return cls.from_days(days, month_ids)
+
+    @classmethod
+    def from_files(cls, json_files=JSON_FILES):
+        return cls.from_days([d for *_, days in read_calendar_months(json_files) for d in days])
+
+    def __len__(self):
+        return len(self.bs)
+
+    def _bs_slot(self, packed):
+        return ((packed // 10000 - self.bs_first_year) * 12 + packed // 100 % 100 - 1) * BS_MONTH_SLOTS + packed % 100 - 1
+
+    def offset(self, value):
+        """Index of an AD date in the arrays, or None when it is outside the calendars."""
+        offset = to_ordinal(value) - self.first
+        return offset if 0 <= offset < len(self.bs) and self.bs[offset] else None
+
+    def ad_to_bs(self, value):
+        offset = self.offset(value)
+        return unpack_bs(self.bs[offset]) if offset is not None else None
+
+    def bs_to_ordinal(self, bs):
+        packed = pack_bs(bs) if isinstance(bs, str) else bs
+        month, day = packed // 100 % 100, packed % 100
+        if not (1 <= month <= 12 and 1 <= day <= BS_MONTH_SLOTS):
+            return None
+        slot = self._bs_slot(packed)
+        if not 0 <= slot < len(self.ad_by_bs) or self.ad_by_bs[slot] < 0:
+            return None
+        return self.first + self.ad_by_bs[slot]
+
+    def bs_to_ad(self, bs):
+        ordinal = self.bs_to_ordinal(bs)
+        return date.fromordinal(ordinal).isoformat() if ordinal is not None else None
+
+    def day(self, value):
+        """The day as the calendar files describe it: {"ad", "bs", "day", "event"}, or None."""
+        offset = self.offset(value)
+        if offset is None:
+            return None
+        ad = date.fromordinal(self.first + offset)
+        event_id = self.event_ids[offset]
+        return {"ad": ad.isoformat(), "bs": unpack_bs(self.bs[offset]), "day": WEEKDAYS[ad.weekday()],
+                "event": self.events[event_id] if event_id >= 0 else None}
+
+    def month_index(self, value):
+        offset = self.offset(value)
+        return self.month_ids[offset] if offset is not None and self.month_ids[offset] >= 0 else None
+
+    def days_between(self, start, end):
+        """Every known day from start to end, both inclusive."""
+        lo = max(0, to_ordinal(start) - self.first)
+        hi = min(len(self.bs), to_ordinal(end) - self.first + 1)
+        return [self.day(self.first + offset) for offset in range(lo, hi) if self.bs[offset]]
+
+    def events_between(self, start, end):
+        """{"event", "bs", "ad"} for every event day from start to end, both inclusive."""
+        lo = bisect.bisect_left(self.event_days, to_ordinal(start) - self.first)
+        hi = bisect.bisect_right(self.event_days, to_ordinal(end) - self.first)
+        return [dict(row) for row in self.event_rows[lo:hi]]
+
+    def upcoming_events(self, today_ordinal):
+        """Events on or after today, soonest first, with their days_left countdown."""
+        start = bisect.bisect_left(self.event_days, today_ordinal - self.first)
+        base = self.first - today_ordinal
+        return [dict(row, days_left=base + offset)
+                for row, offset in zip(self.event_rows[start:], self.event_days[start:])]
+
+    def _event(self, offset):
+        return {"event": self.events[self.event_ids[offset]], "bs": unpack_bs(self.bs[offset]),
+                "ad": date.fromordinal(self.first + offset).isoformat()}
+
+    def to_bytes(self):
+        """Header, little-endian BS and event-id columns, then the event names as a JSON list."""
+        bs, event_ids = array('I', self.bs), array('i', self.event_ids)
+        if sys.byteorder == "big":
+            bs.byteswap()
+            event_ids.byteswap()
+        header = BINARY_HEADER.pack(BINARY_MAGIC, 1, self.first, self.bs_first_year, len(self.bs))
+        return header + bs.tobytes() + event_ids.tobytes() + json.dumps(self.events, ensure_ascii=False).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, _, first, _, size = BINARY_HEADER.unpack_from(data)
+        if magic != BINARY_MAGIC:
+            raise ValueError("Not a date table")
+        pos = BINARY_HEADER.size
+        bs, event_ids = array('I'), array('i')
+        bs.frombytes(data[pos:pos + 4 * size])
+        event_ids.frombytes(data[pos + 4 * size:pos + 8 * size])
+        if sys.byteorder == "big":
+            bs.byteswap()
+            event_ids.byteswap()
+        events = json.loads(data[pos + 8 * size:].decode("utf-8"))
+        return cls(first, bs, event_ids, array('i', [-1]) * size, events)
+
+    def to_json(self):
+        """{"start": first AD date, "bs": [packed BS per day, 0 if unknown], "events": [[day index, name]]}."""
+        return json.dumps({
+            "start": date.fromordinal(self.first).isoformat(),
+            "bs": list(self.bs),
+            "events": [[offset, self.events[self.event_ids[offset]]] for offset in self.event_days],
+        }, ensure_ascii=False, separators=(',', ':'))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert between BS and AD dates.")
+    parser.add_argument("dates", nargs="*", help="AD or BS dates as YYYY-MM-DD")
+    parser.add_argument("--calendar", nargs="+", default=JSON_FILES, help="Calendar JSON files to load")
+    parser.add_argument("--export-json", metavar="PATH")
+    parser.add_argument("--export-bin", metavar="PATH")
+    args = parser.parse_args()
+
+    table = DateTable.from_files(args.calendar)
+    for value in args.dates:
+        # BS years run about 57 years ahead of AD ones
+        if int(value[:4]) > 2070:
+            print(f"{value} BS = {table.bs_to_ad(value)} AD")
+        else:
+            print(f"{value} AD = {table.ad_to_bs(value)} BS")
+    if args.export_json:
+        with open(args.export_json, 'w', encoding='utf-8') as f:
+            f.write(table.to_json())
+        print(f"Wrote {args.export_json}")
+    if args.export_bin:
+        with open(args.export_bin, 'wb') as f:
+            f.write(table.to_bytes())
+        print(f"Wrote {args.export_bin}")
@@ -0,0 +1,288 @@
+"""One long-running process for every scheduled job, instead of a cold Python start per cron run.
+
+Each job keeps its warm state between runs: imported modules, the scrapers' pooled HTTP
+sessions and caches, the spec store, and the parsed calendar (re-read only when a date/*.json
+file changes). A job that is still running when it comes due again is skipped, not stacked.
+Every run saves a metrics.py report under .build/metrics/<job>.json.
+Schedules use the same UTC cron expressions as the workflows (minute, hour, day of month,
+month, day of week; with *, */n, a-b and a,b).
+
+The clock is injectable: FakeClock advances only when the scheduler sleeps, so a day of
+schedules can be replayed instantly.
+
+Usage:
+    python scheduler.py                 # Run forever
+    python scheduler.py --list          # Show the jobs and their next run
+    python scheduler.py --once sitemap  # Run one job now and exit
+"""
+import argparse
+import importlib
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import metrics
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# --- CONFIGURATION ---
+# Same schedules as the GitHub workflows (UTC)
+SCHEDULES = {
+    "site": "15 18 * * *",        # daily.yml
+    "xauusd": "0,15,30,45 * * * *",  # xauusd.yml
+    "batch": "0 * * * *",         # phone.yml
+    "latest": "0 * * * *",        # latest_scrape.yml
+    "sitemap": "0 0 * * *",       # sitemap.yml
+}
+MAX_WORKERS = 4
+MAX_SLEEP = 60  # Seconds between checks, so clock jumps are noticed
+
+class Cron:
+    """A five-field cron expression."""
+    RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Expected 5 cron fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse(field, lo, hi) for field, (lo, hi) in zip(fields, self.RANGES))
+        self.any_day, self.any_weekday = fields[2] == "*", fields[4] == "*"
+
+    @staticmethod
+    def _parse(field, lo, hi):
+        values = set()
+        for part in field.split(","):
+            spec, _, step = part.partition("/")
+            if spec == "*":
+                start, end = lo, hi
+            elif "-" in spec:
+                start, end = (int(x) for x in spec.split("-"))
+            else:
+                start = end = int(spec)
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return values
+
+    def _day_matches(self, t):
+        weekday = (t.weekday() + 1) % 7  # cron counts from Sunday
+        if self.any_day or self.any_weekday:
+            return t.day in self.days and weekday in self.weekdays
+        return t.day in self.days or weekday in self.weekdays
+
+    def next_after(self, after):
+        """The first matching minute strictly after `after`."""
+        t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        while True:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+
+class SystemClock:
+    def now(self):
+        return datetime.now(timezone.utc)
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+class FakeClock:
+    """Starts at `start` (UTC) and moves forward only through sleep() or advance()."""
+
+    def __init__(self, start):
+        self.current = start
+
+    def now(self):
+        return self.current
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        self.current += timedelta(seconds=seconds)
+
+class Job:
+    def __init__(self, name, cron, func):
+        self.name = name
+        self.cron = Cron(cron)
+        self.func = func
+        self.next_run = None
+        self.running = False
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_seconds = None
+
+class Scheduler:
+    def __init__(self, clock=None, max_workers=MAX_WORKERS, executor=None, log=print):
+        self.clock = clock or SystemClock()
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers)
+        self.log = log
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def add(self, name, cron, func):
+        job = Job(name, cron, func)
+        job.next_run = job.cron.next_after(self.clock.now())
+        self.jobs[name] = job
+        return job
+
+    def run_pending(self):
+        """Starts every due job that is not already running. Returns the names started."""
+        now = self.clock.now()
+        started = []
+        for job in self.jobs.values():
+            if job.next_run > now:
+                continue
+            job.next_run = job.cron.next_after(now)
+            with self.lock:
+                if job.running:
+                    job.skipped += 1
+                    self.log(f"[{job.name}] still running, skipping this run")
+                    continue
+                job.running = True
+            started.append(job.name)
+            self.executor.submit(self._run, job)
+        return started
+
+    def run_now(self, name):
+        """Runs a job on the calling thread, unless it is already running. Returns True if it ran."""
+        job = self.jobs[name]
+        with self.lock:
+            if job.running:
+                return False
+            job.running = True
+        self._run(job)
+        return True
+
+    def _run(self, job):
+        start = time.perf_counter()
+        report = metrics.start(job.name)
+        try:
+            job.func()
+        except Exception as e:
+            job.failures += 1
+            report.count("failures")
+            self.log(f"[{job.name}] failed: {e!r}")
+        finally:
+            job.last_seconds = time.perf_counter() - start
+            job.runs += 1
+            with self.lock:
+                job.running = False
+            try:
+                report.save()
+            except OSError as e:
+                self.log(f"[{job.name}] could not save its report: {e}")
+            self.log(f"[{job.name}] finished: {report.summary()}")
+
+    def seconds_until_next(self):
+        next_run = min(job.next_run for job in self.jobs.values())
+        return max(0.0, (next_run - self.clock.now()).total_seconds())
+
+    def run_forever(self, until=None):
+        """Loops until `until` (a datetime), or forever."""
+        while until is None or self.clock.now() < until:
+            self.run_pending()
+            self.clock.sleep(min(MAX_SLEEP, self.seconds_until_next()) or 1)
+
+# --- JOBS ---
+# Each factory imports its module once and returns the callable the scheduler keeps
+
+def site_job():
+    site = importlib.import_module("100")
+    calendar = {}
+
+    def run():
+        # Re-parse the calendar only when one of its files changed
+        stamp = [os.path.getmtime(p) for p in site.JSON_FILES if os.path.exists(p)]
+        if calendar.get("stamp") != stamp:
+            calendar.update(stamp=stamp, months=site.load_calendar(site.JSON_FILES))
+        site.build_site(months=calendar["months"])
+    return run
+
+def xauusd_job():
+    collect_data = importlib.import_module("collect_data")
+    collect_data.tvdatafeed()  # Its heavy imports happen once, here
+    return lambda: collect_data.update_json(export_every=collect_data.EXPORT_EVERY)
+
+def batch_job(store=None):
+    batch_scraper = importlib.import_module("batch_scraper")
+    from spec_store import SpecStore
+    fetcher = batch_scraper.new_fetcher()
+    store = store or SpecStore()
+
+    def run():
+        fetcher.timings.clear()
+        batch_scraper.run_batch(fetcher=fetcher, store=store)
+    return run
+
+def latest_job(store=None):
+    latest_scraper = importlib.import_module("latest_scraper")
+    from fetcher import Fetcher
+    from http_cache import HttpCache
+    from spec_store import SpecStore
+    fetcher = Fetcher(cache=HttpCache(latest_scraper.HTTP_CACHE_FILE))
+    store = store or SpecStore()
+
+    def run():
+        fetcher.timings.clear()
+        latest_scraper.scrape_latest(fetcher=fetcher, store=store)
+    return run
+
+def sitemap_job():
+    return importlib.import_module("generate_sitemap").generate
+
+JOB_FACTORIES = {"site": site_job, "xauusd": xauusd_job, "batch": batch_job,
+                 "latest": latest_job, "sitemap": sitemap_job}
+# Both run at the top of the hour and write specstore/: they get one SpecStore between them,
+# since two instances would each save() their own copy of devices.json over the other's
+STORE_JOBS = {"batch", "latest"}
+
+def build_scheduler(names=None, clock=None, log=print):
+    """A Scheduler with the named jobs (all by default). A job whose imports fail is left out."""
+    os.chdir(ROOT)
+    for path in (ROOT, os.path.join(ROOT, "scrapers")):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    scheduler = Scheduler(clock=clock, log=log)
+    store = None
+    for name in names or JOB_FACTORIES:
+        try:
+            if name in STORE_JOBS:
+                if store is None:
+                    from spec_store import SpecStore
+                    store = SpecStore()
+                func = JOB_FACTORIES[name](store)
+            else:
+                func = JOB_FACTORIES[name]()
+            scheduler.add(name, SCHEDULES[name], func)
+        except ImportError as e:
+            log(f"[{name}] disabled: {e}")
+    return scheduler
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every scheduled job from one warm process.")
+    parser.add_argument("--jobs", nargs="+", choices=list(JOB_FACTORIES), help="Only these jobs")
+    parser.add_argument("--once", choices=list(JOB_FACTORIES), help="Run this job now and exit")
+    parser.add_argument("--list", action="store_true", help="List jobs and their next run")
+    args = parser.parse_args()
+
+    scheduler = build_scheduler([args.once] if args.once else args.jobs)
+    if args.list:
+        for job in scheduler.jobs.values():
+            print(f"{job.name:<8} {job.cron.expression:<20} next {job.next_run:%Y-%m-%d %H:%M} UTC")
+    elif args.once:
+        if args.once in scheduler.jobs:
+            scheduler.run_now(args.once)
+    else:
+        print(f"Scheduler started with {len(scheduler.jobs)} jobs: {', '.join(scheduler.jobs)}")
+        scheduler.run_forever()
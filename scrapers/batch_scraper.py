@@ -1,11 +1,25 @@
-import requests
-from bs4 import BeautifulSoup
-import json
 import os
-import time
+import sys
+from functools import partial
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # metrics.py is in the repo root
+import metrics
+from fetcher import Fetcher, RETRY_STATUSES
+from http_cache import HttpCache
+from spec_parser import parse_device_page
+from spec_store import SpecStore
+from sweeper import sweep, WORKERS
 
 BASE_URL = "https://www.gsmarena.com/"
 CHECKPOINT_FILE = "data/last_scraped_id.txt"
+HTTP_CACHE_FILE = ".build/http_cache_batch.json"
+
+def new_fetcher():
+    # Shared session for all sweep workers; the limiter sets the global request budget (replaces sleep(1)).
+    # Conditional requests skip re-parsing pages seen on an earlier run.
+    return Fetcher(headers={"User-Agent": "Mozilla/5.0"}, max_workers=WORKERS, rate=1,
+                   cache=HttpCache(HTTP_CACHE_FILE))
 
 def get_last_id():
     if os.path.exists(CHECKPOINT_FILE):
@@ -17,58 +31,67 @@ def save_last_id(current_id):
     with open(CHECKPOINT_FILE, "w") as f:
         f.write(str(current_id))
 
-def scrape_by_id(mobile_id):
+def scrape_by_id(mobile_id, fetcher, store):
+    """True if the ID exists and was saved, False if it does not exist, None if it should be retried."""
     # Note: GSMArena URLs usually follow a slug-id.php format. 
     # Since we don't have the slug, we first hit a generic link or search
     # to find the correct redirect URL for that ID.
     test_url = f"{BASE_URL}phone-recorder.php3?idPhone={mobile_id}"
-    headers = {"User-Agent": "Mozilla/5.0"}
     
     try:
-        response = requests.get(test_url, headers=headers, allow_redirects=True, timeout=10)
-        if response.status_code != 200 or "res.php" in response.url:
+        response = fetcher.get(test_url, allow_redirects=True)
+        saved = store.has(mobile_id, "data")
+        if response.status_code == 304 and not saved:
+            # In the HTTP cache but not in the store: a 304 has no body to parse, so ask for the page itself
+            response = fetcher.get(test_url, conditional=False, allow_redirects=True)
+        if "res.php" in response.url:
+            return False # ID doesn't exist yet
+        if response.unchanged and saved:
+            metrics.count("pages_unchanged")
+            return True # Already saved and nothing changed upstream
+        if response.status_code in RETRY_STATUSES:
+            return None # Server trouble, not a missing ID
+        if response.status_code != 200:
             return False # ID doesn't exist yet
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        model_name = soup.find('h1', class_='specs-phone-name-title').text.replace(" ", "_").lower()
+        with metrics.stage("parse"):
+            device = parse_device_page(response.text)
+        model_name = device.model_name.replace(" ", "_").lower()
         folder_path = f"data/{model_name}-{mobile_id}"
         
-        os.makedirs(folder_path, exist_ok=True)
-        
-        # Extract Specs
-        specs = {}
-        for table in soup.find_all('table'):
-            section = table.find('th').text if table.find('th') else "General"
-            specs[section] = {tr.find('td', class_='ttl').text: tr.find('td', class_='nfo').text 
-                              for tr in table.find_all('tr') if tr.find('td', class_='ttl')}
-        
-        with open(f"{folder_path}/specs.json", "w") as f:
-            json.dump(specs, f, indent=4)
+        # The lock keeps the record and its folder in step when the store is shared (scheduler.py)
+        with metrics.stage("write"), store.lock:
+            store.put(mobile_id, model_name, device.specs, folder_path, device.image_url)
+            written = store.materialize([mobile_id], sources=["data"])
+        fetcher.commit(response)  # Only now may the next run skip this page
+        metrics.count("files_written" if written else "files_skipped")
         return True
-    except:
-        return False
+    except requests.RequestException:
+        return None
+    except Exception as e:
+        # A page that fails to parse or save is retried next run, not recorded as missing
+        print(f"Error scraping ID {mobile_id}: {e!r}")
+        return None
 
-if __name__ == "__main__":
-    start_id = get_last_id()
-    count = 0
-    current_id = start_id + 1
-    
-    print(f"Starting batch from ID: {current_id}")
-    
-    # Process exactly 100 successful models
-    while count < 100:
-        success = scrape_by_id(current_id)
-        if success:
-            print(f"Successfully scraped ID: {current_id}")
-            count += 1
-        else:
-            print(f"ID {current_id} not found, skipping...")
-        
-        current_id += 1
-        time.sleep(1) # Ethical delay to avoid bans
-        
-        # Safety break if we hit a massive gap in IDs
-        if current_id > start_id + 500: 
-            break
+def run_batch(fetcher=None, store=None):
+    fetcher = fetcher or new_fetcher()
+    store = store or SpecStore()
+    # Sharded, checkpointed sweep; the first run starts after the legacy checkpoint
+    state = sweep(partial(scrape_by_id, fetcher=fetcher, store=store), get_last_id() + 1)
 
-    save_last_id(current_id - 1)
+    # Keep the legacy checkpoint meaning "everything up to here is done"
+    with metrics.stage("write"):
+        save_last_id(state.cursor - 1)
+        store.save()
+        fetcher.cache.save()
+    print(f"Fetch timing: {fetcher.summary()}")
+    return state
+
+def main():
+    report = metrics.start("batch")
+    run_batch()
+    report.save()
+    print(report.summary())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""SQLite catalog of every scraped device, compiled from the latest/ and data/ specs.json folders.
+
+Each device is one row with normalized numeric columns (announce date, RAM, storage, battery,
+display size, weight) plus an FTS5 index over its name and every spec value. update() only
+re-reads folders whose specs.json changed (by size and mtime, then by content hash) and drops
+folders that are gone.
+
+Run from the repository root:
+    python scrapers/catalog.py update
+    python scrapers/catalog.py search snapdragon 5g --min-ram 8 --max-weight 200 --year 2026
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+
+# --- CONFIGURATION ---
+CATALOG_FILE = ".build/catalog.sqlite"
+SOURCES = ["latest", "data"]
+
+MONTHS = {m: i for i, m in enumerate(["january", "february", "march", "april", "may", "june", "july", "august",
+                                       "september", "october", "november", "december"], 1)}
+UNITS_GB = {"MB": 1 / 1024, "GB": 1, "TB": 1024}
+
+# Numeric columns that search() accepts min_/max_ filters for
+NUMERIC_COLUMNS = ["announced_year", "ram_gb", "storage_gb", "battery_mah", "display_in", "weight_g"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    folder TEXT PRIMARY KEY,
+    source TEXT,
+    gsmarena_id INTEGER,
+    name TEXT,
+    image_url TEXT,
+    announced TEXT,
+    announced_year INTEGER,
+    ram_gb REAL,
+    storage_gb REAL,
+    battery_mah INTEGER,
+    display_in REAL,
+    weight_g REAL,
+    os TEXT,
+    chipset TEXT,
+    specs TEXT,
+    size INTEGER,
+    mtime_ns INTEGER,
+    sha256 TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS devices_fts USING fts5(name, specs);
+CREATE INDEX IF NOT EXISTS devices_announced ON devices(announced);
+"""
+
+def _number(pattern, text):
+    match = re.search(pattern, text or "")
+    return float(match.group(1)) if match else None
+
+def parse_announced(text):
+    """'2025, March 25' -> '2025-03-25', '2025, March' -> '2025-03', '2025, Q4' -> '2025-10'."""
+    match = re.search(r"(\d{4})(?:,\s*(Q[1-4]|[A-Za-z]+)(?:\s+(\d{1,2}))?)?", text or "")
+    if not match:
+        return None
+    year, period, day = match.groups()
+    if period and period.startswith("Q"):
+        return f"{year}-{(int(period[1]) - 1) * 3 + 1:02d}"
+    month = MONTHS.get((period or "").lower())
+    if not month:
+        return year
+    return f"{year}-{month:02d}-{int(day):02d}" if day else f"{year}-{month:02d}"
+
+def parse_memory(text):
+    """Largest (storage_gb, ram_gb) across the '128GB 8GB RAM, 256GB 12GB RAM' variants."""
+    storage, ram = [], []
+    for size, unit, ram_size, ram_unit in re.findall(r"(\d+(?:\.\d+)?)(MB|GB|TB)\s+(\d+(?:\.\d+)?)(MB|GB)\s+RAM", text or ""):
+        storage.append(float(size) * UNITS_GB[unit])
+        ram.append(float(ram_size) * UNITS_GB[ram_unit])
+    return (max(storage) if storage else None), (max(ram) if ram else None)
+
+def normalize(specs):
+    """The catalog's derived columns for one {section: {field: value}} specs dict."""
+    section = lambda name: specs.get(name, {})
+    announced = parse_announced(section("Launch").get("Announced"))
+    storage_gb, ram_gb = parse_memory(section("Memory").get("Internal"))
+    battery = _number(r"(\d+)\s*mAh", " ".join(section("Battery").values()))
+    return {
+        "announced": announced,
+        "announced_year": int(announced[:4]) if announced else None,
+        "ram_gb": ram_gb,
+        "storage_gb": storage_gb,
+        "battery_mah": int(battery) if battery else None,
+        "display_in": _number(r"(\d+(?:\.\d+)?)\s*inches", section("Display").get("Size")),
+        "weight_g": _number(r"(\d+(?:\.\d+)?)\s*g\b", section("Body").get("Weight")),
+        "os": section("Platform").get("OS"),
+        "chipset": section("Platform").get("Chipset"),
+    }
+
+def _fts_query(text):
+    # Every word must match, as a prefix; quoting keeps FTS5 syntax characters literal
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in text.split())
+
+class Catalog:
+    def __init__(self, path=CATALOG_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def update(self, sources=SOURCES):
+        """Re-indexes new and changed specs.json folders, drops removed ones. Returns counters."""
+        known = {row["folder"]: row for row in self.conn.execute("SELECT folder, size, mtime_ns, sha256 FROM devices")}
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+        seen = set()
+        with self.conn:
+            for source in sources:
+                if not os.path.isdir(source):
+                    continue
+                for name in os.listdir(source):
+                    path = os.path.join(source, name, "specs.json")
+                    if not os.path.isfile(path):
+                        continue
+                    folder = f"{source}/{name}"
+                    seen.add(folder)
+                    st = os.stat(path)
+                    row = known.get(folder)
+                    if row and (row["size"], row["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+                        stats["unchanged"] += 1
+                        continue
+                    with open(path, "rb") as f:
+                        raw = f.read()
+                    digest = hashlib.sha256(raw).hexdigest()
+                    if row and row["sha256"] == digest:
+                        self.conn.execute("UPDATE devices SET size = ?, mtime_ns = ? WHERE folder = ?",
+                                          (st.st_size, st.st_mtime_ns, folder))
+                        stats["unchanged"] += 1
+                        continue
+                    self._index(folder, source, name, json.loads(raw), st, digest)
+                    stats["updated" if row else "added"] += 1
+
+            for folder in set(known) - seen:
+                self._delete(folder)
+                stats["removed"] += 1
+        return stats
+
+    def _index(self, folder, source, name, saved, st, digest):
+        # latest/ wraps the specs with the image URL; data/ stores the specs alone
+        specs = saved.get("specifications", saved)
+        model, _, mobile_id = name.rpartition("-")
+        row = dict(normalize(specs), folder=folder, source=source,
+                   gsmarena_id=int(mobile_id) if mobile_id.isdigit() else None,
+                   name=(model or name).replace("_", " "), image_url=saved.get("device_image_url"),
+                   specs=json.dumps(specs), size=st.st_size, mtime_ns=st.st_mtime_ns, sha256=digest)
+        self._delete(folder)
+        columns = ", ".join(row)
+        cursor = self.conn.execute(f"INSERT INTO devices ({columns}) VALUES ({', '.join('?' * len(row))})",
+                                   list(row.values()))
+        text = " ".join(f"{section} {field} {value}" for section, fields in specs.items()
+                        for field, value in fields.items())
+        self.conn.execute("INSERT INTO devices_fts (rowid, name, specs) VALUES (?, ?, ?)",
+                          (cursor.lastrowid, row["name"], text))
+
+    def _delete(self, folder):
+        row = self.conn.execute("SELECT rowid FROM devices WHERE folder = ?", (folder,)).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM devices_fts WHERE rowid = ?", (row[0],))
+            self.conn.execute("DELETE FROM devices WHERE rowid = ?", (row[0],))
+
+    def search(self, text=None, order_by="announced", descending=True, limit=50, **filters):
+        """Devices matching every word of `text` (full-text, prefix) and the filters.
+
+        Filters are min_<column>=x / max_<column>=x for NUMERIC_COLUMNS, plus source="latest".
+        Rows come back as dicts without the raw specs; use get() for those.
+        """
+        where, params = [], []
+        if text:
+            where.append("d.rowid IN (SELECT rowid FROM devices_fts WHERE devices_fts MATCH ?)")
+            params.append(_fts_query(text))
+        for key, value in filters.items():
+            if value is None:
+                continue
+            bound, _, column = key.partition("_")
+            if key == "source":
+                where.append("d.source = ?")
+            elif bound in ("min", "max") and column in NUMERIC_COLUMNS:
+                where.append(f"d.{column} {'>=' if bound == 'min' else '<='} ?")
+            else:
+                raise ValueError(f"Unknown filter: {key}")
+            params.append(value)
+        if order_by not in NUMERIC_COLUMNS + ["announced", "name"]:
+            raise ValueError(f"Cannot order by: {order_by}")
+
+        sql = (f"SELECT {', '.join('d.' + c for c in ['folder', 'name', 'announced'] + NUMERIC_COLUMNS[1:] + ['os', 'chipset'])} "
+               f"FROM devices d {'WHERE ' + ' AND '.join(where) if where else ''} "
+               f"ORDER BY d.{order_by} IS NULL, d.{order_by} {'DESC' if descending else 'ASC'} LIMIT ?")
+        return [dict(row) for row in self.conn.execute(sql, params + [limit])]
+
+    def get(self, folder):
+        row = self.conn.execute("SELECT * FROM devices WHERE folder = ?", (folder,)).fetchone()
+        if not row:
+            return None
+        device = dict(row)
+        device["specs"] = json.loads(device["specs"])
+        return device
+
+    def close(self):
+        self.conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the device catalog.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("update", help="Index new and changed specs.json folders")
+    search = sub.add_parser("search", help="Full-text search with numeric filters")
+    search.add_argument("text", nargs="*", help="Words that must all appear (prefix match)")
+    search.add_argument("--year", type=int, help="Announced in this year")
+    for column, flag in [("ram_gb", "ram"), ("storage_gb", "storage"), ("battery_mah", "battery"),
+                         ("display_in", "display"), ("weight_g", "weight")]:
+        search.add_argument(f"--min-{flag}", type=float, dest=f"min_{column}")
+        search.add_argument(f"--max-{flag}", type=float, dest=f"max_{column}")
+    search.add_argument("--source", choices=SOURCES)
+    search.add_argument("--order-by", default="announced", choices=NUMERIC_COLUMNS + ["announced", "name"])
+    search.add_argument("--ascending", action="store_true")
+    search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    catalog = Catalog()
+    stats = catalog.update()
+    if args.command == "update":
+        print(f"Catalog: {stats['added']} added, {stats['updated']} updated, "
+              f"{stats['unchanged']} unchanged, {stats['removed']} removed")
+        return
+
+    filters = {key: value for key, value in vars(args).items() if key.startswith(("min_", "max_"))}
+    if args.year:
+        filters["min_announced_year"] = filters["max_announced_year"] = args.year
+    rows = catalog.search(" ".join(args.text) or None, order_by=args.order_by, descending=not args.ascending,
+                          limit=args.limit, source=args.source, **filters)
+    for row in rows:
+        details = ", ".join(f"{c} {row[c]:g}" for c in NUMERIC_COLUMNS[1:] if row[c] is not None)
+        print(f"{row['announced'] or '?':<10}  {row['name']:<40}  {details}")
+    print(f"{len(rows)} devices")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+# --- CONFIGURATION ---
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+MAX_WORKERS = 4          # Concurrent requests in flight
+REQUESTS_PER_SECOND = 2  # Per host, shared by all workers
+RETRIES = 3
+BACKOFF = 1.0            # Seconds; doubles after every failed attempt
+TIMEOUT = 10
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least 1/rate seconds apart, across threads."""
+
+    def __init__(self, rate, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self.next_slot = {}
+        self.lock = threading.Lock()
+
+    def wait(self, host):
+        with self.lock:
+            now = self.clock()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            self.sleep(slot - now)
+
+class Fetcher:
+    """Pooled, rate-limited HTTP GETs with retries and per-request timing.
+
+    One requests.Session is shared by all workers so connections to the same host are reused.
+    Every attempt is recorded in self.timings as {"url", "status", "seconds", "attempt"}.
+    With an HttpCache, requests are conditional and responses carry `unchanged=True` when the
+    page is the same as on the last run (a 304, or a 200 with an identical body). Callers
+    commit() a response once they have saved what they took from it.
+    """
+
+    def __init__(self, headers=None, max_workers=MAX_WORKERS, rate=REQUESTS_PER_SECOND,
+                 retries=RETRIES, backoff=BACKOFF, timeout=TIMEOUT, session=None, sleep=time.sleep, cache=None):
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.sleep = sleep
+        self.cache = cache
+        self.limiter = HostRateLimiter(rate, sleep=sleep)
+        self.timings = []
+        self.lock = threading.Lock()
+
+        self.session = session or requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url, conditional=True, **kwargs):
+        """GETs url, retrying connection errors and 429/5xx responses with exponential backoff.
+
+        Returns the last response (which may still be an error status) or raises the last exception.
+        Pass conditional=False to always get the full body even when a cache is attached.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if self.cache and conditional:
+            kwargs["headers"] = {**self.cache.conditional_headers(url), **kwargs.get("headers", {})}
+        host = urlsplit(url).netloc
+        for attempt in range(self.retries + 1):
+            self.limiter.wait(host)
+            start = time.perf_counter()
+            try:
+                with metrics.stage("network"):
+                    response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(url, None, start, attempt)
+                metrics.count("request_errors")
+                if attempt == self.retries:
+                    raise
+                self.sleep(self.backoff * 2 ** attempt)
+                continue
+
+            self._record(url, response.status_code, start, attempt)
+            metrics.count("requests")
+            metrics.count("bytes", len(response.content))
+            if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                response.cache_url = url
+                response.unchanged = self.cache.is_unchanged(url, response) if self.cache and conditional else False
+                return response
+            self.sleep(self._retry_delay(response, attempt))
+
+    def commit(self, response):
+        """Marks a fetched page as processed, so the next run can skip it while it is unchanged."""
+        if self.cache:
+            self.cache.commit(response.cache_url, response)
+
+    def map(self, urls, **kwargs):
+        """Fetches urls concurrently. Yields (url, response, error) in input order."""
+        def fetch(url):
+            try:
+                return url, self.get(url, **kwargs), None
+            except requests.RequestException as e:
+                return url, None, e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            yield from pool.map(metrics.bind(fetch), urls)
+
+    def summary(self):
+        """One-line timing report over every recorded attempt."""
+        if not self.timings:
+            return "No requests made."
+        seconds = sorted(t["seconds"] for t in self.timings)
+        retried = sum(1 for t in self.timings if t["attempt"] > 0)
+        p95 = seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))]
+        return (f"{len(seconds)} requests ({retried} retries): total {sum(seconds):.1f}s, "
+                f"avg {sum(seconds) / len(seconds):.2f}s, p95 {p95:.2f}s, max {seconds[-1]:.2f}s")
+
+    def _retry_delay(self, response, attempt):
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * 2 ** attempt
+
+    def _record(self, url, status, start, attempt):
+        with self.lock:
+            self.timings.append({"url": url, "status": status,
+                                 "seconds": time.perf_counter() - start, "attempt": attempt})
@@ -0,0 +1,65 @@
+import hashlib
+import threading
+
+from json_files import read_json, write_json
+
+class HttpCache:
+    """Persistent ETag / Last-Modified validators and body hashes, keyed by URL.
+
+    Bodies themselves are not stored: a page is only re-parsed when the server says it changed
+    and its content hash differs from the last run, so the validators are all we need.
+
+    is_unchanged() only compares. A page's entry is recorded by commit(), which callers make
+    once the page has been processed and saved, so a failed or skipped page is fetched and
+    processed again on the next run.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+        self.entries = read_json(path)
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since headers for a conditional GET of url."""
+        entry = self.entries.get(url, {})
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def is_unchanged(self, url, response):
+        """True if the content is the same as when url was last committed.
+
+        A 304 is unchanged by definition; a 200 is unchanged when its body hash matches.
+        """
+        with self.lock:
+            previous = self.entries.get(url)
+        if response.status_code == 304:
+            return previous is not None
+        if response.status_code != 200 or previous is None:
+            return False
+        return previous.get("sha256") == hashlib.sha256(response.content).hexdigest()
+
+    def commit(self, url, response):
+        """Records a 200 response's validators and body hash for url."""
+        if response.status_code != 200:
+            return
+        entry = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": hashlib.sha256(response.content).hexdigest(),
+        }
+        with self.lock:
+            if self.entries.get(url) != entry:
+                self.entries[url] = entry
+                self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        write_json(self.path, self.entries, sort_keys=True)
+        self.dirty = False
@@ -1,9 +1,18 @@
-import requests
-from bs4 import BeautifulSoup
-import json
 import os
+import sys
+from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # metrics.py is in the repo root
+import metrics
+from fetcher import Fetcher
+from http_cache import HttpCache
+from spec_parser import parse_device_page
+from spec_store import SpecStore
+
+BASE_URL = "https://www.gsmarena.com/"
+HTTP_CACHE_FILE = ".build/http_cache_latest.json"
+
 def get_target_months():
     now = datetime.now()
     current = now.strftime("%Y, %B") # e.g., "2026, January"
@@ -11,55 +20,71 @@ def get_target_months():
     last_month = (first_day_current - timedelta(days=1)).strftime("%Y, %B")
     return [current, last_month]
 
-def scrape_latest():
-    headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-    base_url = "https://www.gsmarena.com/"
-    targets = get_target_months()
+def scrape_latest(fetcher=None, base_url=BASE_URL, store=None, targets=None):
+    # One pooled, rate-limited session for the homepage and every device page.
+    # Requests are conditional, so pages unchanged since the last run are not parsed again.
+    # `targets` are the announcement months to keep (this month and last by default).
+    fetcher = fetcher or Fetcher(cache=HttpCache(HTTP_CACHE_FILE))
+    store = store or SpecStore()
+    targets = targets or get_target_months()
     
     print(f"Scanning for devices announced in: {targets}")
     
-    res = requests.get(base_url, headers=headers)
-    soup = BeautifulSoup(res.text, 'html.parser')
+    # The homepage is always needed in full to find the device links
+    res = fetcher.get(base_url, conditional=False)
+    with metrics.stage("parse"):
+        soup = BeautifulSoup(res.text, 'html.parser')
     
     # Target links from 'Latest devices' sidebar and 'Makers' list
     latest_links = [a['href'] for a in soup.select('.module-phones-link, .makers a')]
+    full_urls = [base_url + link if not link.startswith('http') else link for link in latest_links]
     
-    for link in latest_links:
-        full_url = base_url + link if not link.startswith('http') else link
+    # Pages download concurrently; parsing stays on this thread in link order
+    for link, (full_url, device_res, error) in zip(latest_links, fetcher.map(full_urls)):
         try:
-            device_res = requests.get(full_url, headers=headers, timeout=10)
-            dev_soup = BeautifulSoup(device_res.text, 'html.parser')
+            if error:
+                raise error
+            mobile_id = link.split('-')[-1].replace('.php', '')
+            # Pages are only committed to the cache once saved; the store check also covers older cache files
+            if device_res.unchanged and store.has(mobile_id, "latest"):
+                metrics.count("pages_unchanged")
+                continue
+            if device_res.status_code == 304:
+                # In the HTTP cache but not in the store: a 304 has no body, so fetch the page itself
+                device_res = fetcher.get(full_url, conditional=False)
+            with metrics.stage("parse"):
+                device = parse_device_page(device_res.text)
             
             # 1. Filter by Announcement Date
-            announced_tag = dev_soup.find('td', {'data-spec': 'year'})
-            announced_date = announced_tag.text if announced_tag else ""
-            
-            if any(m in announced_date for m in targets):
-                model_name = dev_soup.find('h1', class_='specs-phone-name-title').text.replace(" ", "_").lower()
-                mobile_id = link.split('-')[-1].replace('.php', '')
+            if any(m in device.announced for m in targets):
+                model_name = device.model_name.replace(" ", "_").lower()
                 folder_path = f"latest/{model_name}-{mobile_id}"
-                os.makedirs(folder_path, exist_ok=True)
-                
-                # 2. Extract Official Image URL
-                img_container = dev_soup.find('div', class_='specs-photo-main')
-                device_image_url = img_container.find('img')['src'] if img_container else "N/A"
                 
-                # 3. Extract Specs
-                specs_data = {"device_image_url": device_image_url, "specifications": {}}
-                for table in dev_soup.find_all('table'):
-                    section = table.find('th').text if table.find('th') else "General"
-                    specs_data["specifications"][section] = {
-                        tr.find('td', class_='ttl').text: tr.find('td', class_='nfo').text 
-                        for tr in table.find_all('tr') if tr.find('td', class_='ttl')
-                    }
-                
-                # 4. Export JSON
-                with open(f"{folder_path}/specs.json", "w") as f:
-                    json.dump(specs_data, f, indent=4)
-                print(f"Saved: {folder_path} with image URL.")
+                with metrics.stage("write"), store.lock:
+                    # 2. Official Image URL and 3. Specs (only extracted for matching devices)
+                    store.put(mobile_id, model_name, device.specs, folder_path, device.image_url)
+
+                    # 4. Export JSON (left untouched when identical, to keep the commit clean)
+                    written = store.materialize([mobile_id], sources=["latest"])
+                fetcher.commit(device_res)
+                metrics.count("files_written" if written else "files_skipped")
+                if written:
+                    print(f"Saved: {folder_path} with image URL.")
                 
         except Exception as e:
             print(f"Error processing {link}: {e}")
 
-if __name__ == "__main__":
+    with metrics.stage("write"):
+        store.save()
+        if fetcher.cache:
+            fetcher.cache.save()
+    print(f"Fetch timing: {fetcher.summary()}")
+
+def main():
+    report = metrics.start("latest")
     scrape_latest()
+    report.save()
+    print(report.summary())
+
+if __name__ == "__main__":
+    main()
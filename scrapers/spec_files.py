@@ -0,0 +1,15 @@
+import json
+import os
+
+from json_files import write_text
+
+def write_json_if_changed(path, data):
+    """Writes data as indented JSON unless the file already holds exactly that. Returns True if written."""
+    content = json.dumps(data, indent=4)
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            if f.read() == content:
+                return False
+
+    write_text(path, content)
+    return True
@@ -0,0 +1,151 @@
+"""Shared GSMArena device-page parsing for latest_scraper.py and batch_scraper.py.
+
+Backends, fastest first: selectolax, lxml, then BeautifulSoup's html.parser. The first one
+installed is used unless SPEC_PARSER_BACKEND names another. Every backend walks each spec
+table once, reading the section <th> and each row's ttl/nfo cells in the same pass.
+"""
+import os
+from functools import cached_property
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+def available_backends():
+    backends = []
+    if HTMLParser:
+        backends.append("selectolax")
+    if lxml:
+        backends.append("lxml")
+    backends.append("html.parser")
+    return backends
+
+BACKEND = os.environ.get("SPEC_PARSER_BACKEND") or available_backends()[0]
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# lxml equivalents of the CSS selectors below (cssselect is a separate package)
+LXML_XPATHS = {
+    'h1.specs-phone-name-title': f"//h1[{_has_class('specs-phone-name-title')}]",
+    'td[data-spec="year"]': '//td[@data-spec="year"]',
+    'div.specs-photo-main img': f"//div[{_has_class('specs-photo-main')}]//img",
+}
+
+# BeautifulSoup find() arguments for the same selectors; soupsieve's select_one() is much slower
+BS4_FINDS = {
+    'h1.specs-phone-name-title': [('h1', {'class': 'specs-phone-name-title'})],
+    'td[data-spec="year"]': [('td', {'data-spec': 'year'})],
+    'div.specs-photo-main img': [('div', {'class': 'specs-photo-main'}), ('img', {})],
+}
+
+def _collect_rows(cells):
+    """Single pass over (kind, row_id, classes, text) cells of one table, in document order.
+
+    Returns (section, {ttl: nfo}) using the first <th> as the section name, and the first
+    ttl and nfo cell of every row, like the original per-row find() calls did.
+    """
+    section, rows = None, {}
+    current_row, ttl, nfo = None, None, None
+    for kind, row_id, classes, text in cells:
+        if kind == 'th':
+            if section is None:
+                section = text
+            continue
+        if row_id != current_row:
+            if ttl is not None:
+                rows[ttl] = nfo or ""
+            current_row, ttl, nfo = row_id, None, None
+        if ttl is None and 'ttl' in classes:
+            ttl = text
+        elif nfo is None and 'nfo' in classes:
+            nfo = text
+    if ttl is not None:
+        rows[ttl] = nfo or ""
+    return section or "General", rows
+
+class DevicePage:
+    """A parsed device page. `specs` is only extracted when first used."""
+
+    def __init__(self, html, backend=None):
+        self.backend = backend or BACKEND
+        if self.backend != "html.parser":
+            # Spec values contain \r\n line breaks, which lxml and lexbor normalize to \n.
+            # Keep them as character references so specs.json stays identical across backends.
+            html = html.replace("\r", "&#13;")
+        if self.backend == "selectolax":
+            self._tree = HTMLParser(html)
+        elif self.backend == "lxml":
+            self._tree = lxml.html.fromstring(html)
+        else:
+            from bs4 import BeautifulSoup
+            self._tree = BeautifulSoup(html, 'html.parser')
+
+        self.model_name = self._text('h1.specs-phone-name-title')
+        self.announced = self._text('td[data-spec="year"]') or ""
+        self.image_url = self._attr('div.specs-photo-main img', 'src')
+
+    @cached_property
+    def specs(self):
+        """{section: {field: value}} for every table on the page."""
+        specs = {}
+        for cells in self._tables():
+            section, rows = _collect_rows(cells)
+            specs[section] = rows
+        return specs
+
+    def _text(self, selector):
+        if self.backend == "selectolax":
+            node = self._tree.css_first(selector)
+            return node.text(deep=True) if node else None
+        if self.backend == "lxml":
+            nodes = self._tree.xpath(LXML_XPATHS[selector])
+            return nodes[0].text_content() if nodes else None
+        node = self._bs4_find(selector)
+        return node.text if node else None
+
+    def _attr(self, selector, name):
+        if self.backend == "selectolax":
+            node = self._tree.css_first(selector)
+            return node.attributes.get(name) if node else None
+        if self.backend == "lxml":
+            nodes = self._tree.xpath(LXML_XPATHS[selector])
+            return nodes[0].get(name) if nodes else None
+        node = self._bs4_find(selector)
+        return node.get(name) if node else None
+
+    def _bs4_find(self, selector):
+        node = self._tree
+        for name, attrs in BS4_FINDS[selector]:
+            node = node.find(name, attrs)
+            if node is None:
+                return None
+        return node
+
+    def _tables(self):
+        """Yields, per table, an iterator of (kind, row_id, classes, text) for its th/td cells.
+
+        row_id identifies the parent row: selectolax's node address, the lxml element itself
+        (its proxy stays alive while _collect_rows holds it), or id() of the persistent bs4 Tag.
+        """
+        if self.backend == "selectolax":
+            for table in self._tree.css('table'):
+                yield ((node.tag, node.parent.mem_id, (node.attributes.get('class') or "").split(), node.text(deep=True))
+                       for node in table.css('th, td'))
+        elif self.backend == "lxml":
+            for table in self._tree.iter('table'):
+                yield ((el.tag, el.getparent(), (el.get('class') or "").split(), el.text_content())
+                       for el in table.iter('th', 'td'))
+        else:
+            for table in self._tree.find_all('table'):
+                yield ((cell.name, id(cell.parent), cell.get('class') or (), cell.text)
+                       for cell in table.find_all(['th', 'td']))
+
+def parse_device_page(html, backend=None):
+    return DevicePage(html, backend)
@@ -0,0 +1,258 @@
+"""Content-addressed store for scraped device specs, shared by latest_scraper.py and batch_scraper.py.
+
+Layout under STORE_DIR:
+    blobs/<aa>/<sha256>.json  one specs dict per distinct content, stored once however many
+                              devices, folders or runs produce it
+    devices.json              {gsmarena_id: {"name", "image_url", "blob", "folders", "updated"}}
+    history.jsonl             one line per change: {"time", "id", "blob", "previous", "changes"},
+                              where changes lists {"field", "old", "new"} per changed spec field
+
+The same device scraped into both latest/ and data/ is one record with two folders.
+materialize() writes the classic <folder>/specs.json layout from the store, touching only
+files whose content differs.
+
+The store does not replace those folders: latest/ and data/ stay committed, because they are
+the published layout that catalog.py and other readers of the repo use. Committing the blobs
+as well would put every spec in the repo twice, so only devices.json and history.jsonl are
+committed and blobs/ is a local cache (see .gitignore). In a fresh checkout a device's
+current blob is rebuilt from its folder, which put() reads before materialize() rewrites it.
+The cost: older blobs named by `previous` in history.jsonl are not kept; their content is
+only in the git history of the folders.
+
+The two scrapers share one index, so their workflows run in a single concurrency group and
+never commit devices.json or history.jsonl at the same time.
+
+Run from the repository root:
+    python scrapers/spec_store.py import            # Load the existing latest/ and data/ folders
+    python scrapers/spec_store.py changes --hours 1 # What changed in the last hour
+    python scrapers/spec_store.py materialize
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # json_files.py is in the repo root
+from json_files import read_json, write_json, write_text
+from spec_files import write_json_if_changed
+
+# --- CONFIGURATION ---
+STORE_DIR = "specstore"
+SOURCES = ["latest", "data"]
+IMAGE_FIELD = "device_image_url"
+BLOCK_SIZE = 64 * 1024  # Bytes read at a time when scanning history.jsonl from the end
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def flatten(specs, image_url=None):
+    """{"Section/Field": value}, plus the image URL, for field-level diffs."""
+    fields = {f"{section}/{field}": value for section, rows in specs.items() for field, value in rows.items()}
+    if image_url is not None:
+        fields[IMAGE_FIELD] = image_url
+    return fields
+
+def _reversed_lines(path, block_size=BLOCK_SIZE):
+    """The non-empty lines of a UTF-8 file, last first, read in blocks from the end."""
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        tail = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            lines = (f.read(step) + tail).split(b"\n")
+            tail = lines.pop(0)  # May continue in the previous block
+            for line in reversed(lines):
+                if line.strip():
+                    yield line.decode("utf-8")
+        if tail.strip():
+            yield tail.decode("utf-8")
+
+def _blob_content(specs):
+    return json.dumps(specs, separators=(",", ":"))
+
+def _digest(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def diff_fields(old, new):
+    return [{"field": field, "old": old.get(field), "new": new.get(field)}
+            for field in sorted(set(old) | set(new)) if old.get(field) != new.get(field)]
+
+class SpecStore:
+    def __init__(self, directory=STORE_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "devices.json")
+        self.history_path = os.path.join(directory, "history.jsonl")
+        # Reentrant, so a caller can hold it across put() and save(); the scheduler shares one
+        # store between the batch and latest jobs
+        self.lock = threading.RLock()
+        self.dirty = False
+        self.devices = read_json(self.index_path)
+
+    def has(self, mobile_id, source=None):
+        """True if the device is stored, in a folder under `source` when one is given."""
+        device = self.devices.get(str(mobile_id))
+        return device is not None and (source is None or any(f.split("/", 1)[0] == source for f in device["folders"]))
+
+    def blob_path(self, digest):
+        return os.path.join(self.directory, "blobs", digest[:2], f"{digest}.json")
+
+    def read_blob(self, digest):
+        with open(self.blob_path(digest), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def device_specs(self, device):
+        """The device's current specs, rebuilding its blob from one of its folders if it is missing.
+
+        Returns None when no folder holds that content any more.
+        """
+        if os.path.exists(self.blob_path(device["blob"])):
+            return self.read_blob(device["blob"])
+        for folder in device["folders"]:
+            saved = read_json(f"{folder}/specs.json", default=False)
+            if not saved:
+                continue
+            specs = saved.get("specifications", saved) if folder.startswith("latest/") else saved
+            if _digest(_blob_content(specs)) == device["blob"]:
+                self._write_blob(specs)
+                return specs
+        return None
+
+    def _write_blob(self, specs):
+        content = _blob_content(specs)
+        digest = _digest(content)
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            write_text(path, content)
+        return digest
+
+    def put(self, mobile_id, name, specs, folder, image_url=None):
+        """Records one scraped device. Returns its new history entry, or None if nothing changed.
+
+        A first sighting is logged with previous=None and no field list.
+        """
+        mobile_id = str(mobile_id)
+        digest = self._write_blob(specs)
+        with self.lock:
+            device = self.devices.get(mobile_id)
+            if device is None:
+                device = self.devices[mobile_id] = {"name": name, "image_url": None, "blob": None, "folders": []}
+                self.dirty = True
+            if folder not in device["folders"]:
+                device["folders"] = sorted(device["folders"] + [folder])
+                self.dirty = True
+
+            new_image = image_url if image_url is not None else device["image_url"]
+            if device["blob"] == digest and device["image_url"] == new_image:
+                return None
+            changes = []
+            previous = self.device_specs(device) if device["blob"] else None
+            if previous is not None:
+                changes = diff_fields(flatten(previous, device["image_url"]), flatten(specs, new_image))
+            entry = {"time": _now(), "id": mobile_id, "blob": digest, "previous": device["blob"], "changes": changes}
+            device.update(name=name, image_url=new_image, blob=digest, updated=entry["time"])
+            self.dirty = True
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.history_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+        return entry
+
+    def changes_since(self, since):
+        """History entries newer than `since` (an ISO string like the stored times), oldest first.
+
+        The log is append-only and time-ordered, so it is read backwards from the end and only
+        its tail is read at all.
+        """
+        if not os.path.exists(self.history_path):
+            return []
+        recent = []
+        for line in _reversed_lines(self.history_path):
+            entry = json.loads(line)
+            if entry["time"] <= since:
+                break
+            recent.append(entry)
+        return recent[::-1]
+
+    def folder_payload(self, device, folder):
+        """What <folder>/specs.json holds: latest/ wraps the specs with the image URL."""
+        specs = self.device_specs(device)
+        if specs is None:
+            raise FileNotFoundError(f"No blob or matching folder for {device['name']} ({device['blob']})")
+        if folder.startswith("latest/"):
+            return {IMAGE_FIELD: device["image_url"] or "N/A", "specifications": specs}
+        return specs
+
+    def materialize(self, mobile_ids=None, sources=SOURCES):
+        """Writes <folder>/specs.json for the given devices (all by default). Returns files written."""
+        written = 0
+        with self.lock:
+            for mobile_id in mobile_ids if mobile_ids is not None else list(self.devices):
+                device = self.devices[str(mobile_id)]
+                for folder in device["folders"]:
+                    if folder.split("/", 1)[0] not in sources:
+                        continue
+                    os.makedirs(folder, exist_ok=True)
+                    written += write_json_if_changed(f"{folder}/specs.json", self.folder_payload(device, folder))
+        return written
+
+    def import_folders(self, sources=SOURCES):
+        """Loads existing <source>/<model>-<id>/specs.json folders. Returns how many changed the store."""
+        changed = 0
+        for source in sources:
+            if not os.path.isdir(source):
+                continue
+            for name in sorted(os.listdir(source)):
+                path = os.path.join(source, name, "specs.json")
+                model, _, mobile_id = name.rpartition("-")
+                if not os.path.isfile(path) or not mobile_id.isdigit():
+                    continue
+                with open(path, 'r') as f:
+                    saved = json.load(f)
+                image_url = saved.get(IMAGE_FIELD) if "specifications" in saved else None
+                if image_url == "N/A":
+                    image_url = None
+                changed += self.put(mobile_id, model, saved.get("specifications", saved),
+                                    f"{source}/{name}", image_url) is not None
+        return changed
+
+    def save(self):
+        # Under the lock, so a put() from another thread never lands mid-dump or between the
+        # dump and clearing `dirty`
+        with self.lock:
+            if not self.dirty:
+                return
+            write_json(self.index_path, self.devices, sort_keys=True)
+            self.dirty = False
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-addressed spec store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("import", help="Load the existing latest/ and data/ folders into the store")
+    changes = sub.add_parser("changes", help="List field changes from the last N hours")
+    changes.add_argument("--hours", type=float, default=1)
+    materialize = sub.add_parser("materialize", help="Write <folder>/specs.json for every stored device")
+    materialize.add_argument("--source", choices=SOURCES, action="append")
+    args = parser.parse_args()
+
+    store = SpecStore()
+    if args.command == "import":
+        changed = store.import_folders()
+        store.save()
+        print(f"Imported {changed} changed folders; {len(store.devices)} devices")
+    elif args.command == "changes":
+        since = (datetime.now(timezone.utc) - timedelta(hours=args.hours)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        for entry in store.changes_since(since):
+            name = store.devices[entry["id"]]["name"]
+            new = " (new)" if entry["previous"] is None else ""
+            print(f"{entry['time']}  {name} [{entry['id']}]{new}")
+            for change in entry["changes"]:
+                print(f"    {change['field']}: {change['old']!r} -> {change['new']!r}")
+    else:
+        print(f"Wrote {store.materialize(sources=args.source or SOURCES)} specs.json files")
+
+if __name__ == "__main__":
+    main()
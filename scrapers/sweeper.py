@@ -0,0 +1,206 @@
+"""Sharded, resumable sweep over GSMArena phone IDs for batch_scraper.py.
+
+The IDs past the cursor are cut into shards that workers claim and run concurrently; the
+global request rate is left to the Fetcher's per-host limiter. Every probe result is
+checkpointed atomically, so a crashed or timed-out run resumes exactly where each shard stopped.
+
+State (STATE_FILE):
+    cursor         every ID below it is resolved and never probed again
+    highest_found  the newest ID known to exist
+    found          IDs at or above the cursor that exist
+    gaps           IDs that missed while a higher ID already existed; never probed again
+    misses         IDs that missed past the newest phone; they may just not exist *yet*,
+                   so they are probed again on later runs
+    shards         unfinished shards as {key: {"start", "end", "next"}}; the key is the start ID,
+                   with a ".n" suffix when a shard with that key is still pending
+    blocks         learned density, {block: [probed, found]} per BLOCK_SIZE IDs
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from json_files import read_json, write_json
+
+# --- CONFIGURATION ---
+STATE_FILE = "data/sweep_state.json"
+WINDOW = 500        # Furthest a run plans past the cursor
+LOOKAHEAD = 100     # How far past the newest known phone to look for new ones
+SHARD_SIZE = 50
+WORKERS = 4
+MAX_FOUND = 100     # New models per run
+MAX_MISS_RUN = 25   # Consecutive misses past highest_found that end a shard
+BLOCK_SIZE = 100
+
+class SweepState:
+    def __init__(self, path, start_id):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {"cursor": start_id, "highest_found": start_id - 1, "found": [], "gaps": [], "misses": [],
+                     "shards": {}, "blocks": {}}
+        self.data.update(read_json(path))
+        self.found = set(self.data["found"])
+        self.gaps = set(self.data["gaps"])
+        self.misses = set(self.data["misses"])
+        self.new_found = 0
+        self.claimed = set()
+        self._add_recheck_shards()
+
+    @property
+    def cursor(self):
+        return self.data["cursor"]
+
+    @property
+    def highest_found(self):
+        return self.data["highest_found"]
+
+    def is_known(self, mobile_id):
+        """True if probing mobile_id again would be redundant."""
+        return mobile_id in self.found or mobile_id in self.gaps
+
+    def density(self, mobile_id):
+        probed, found = self.data["blocks"].get(str(mobile_id // BLOCK_SIZE), (0, 0))
+        return found / probed if probed else 1.0
+
+    def next_shard(self, window=WINDOW, shard_size=SHARD_SIZE):
+        """Hands a worker its next shard, or None when this run has nothing left to probe.
+
+        Unfinished shards from earlier runs come first, those in historically denser ID ranges
+        ahead of sparse ones and of anything past the newest phone. After that a new shard is
+        cut, as long as it starts within LOOKAHEAD of the newest phone found so far.
+        """
+        with self.lock:
+            shards = self.data["shards"]
+            waiting = [(key, s) for key, s in shards.items() if key not in self.claimed and s["next"] < s["end"]]
+            if waiting:
+                key, shard = min(waiting, key=lambda item: (item[1]["start"] > self.highest_found,
+                                                            -self.density(item[1]["next"])))
+            else:
+                start = max((s["end"] for s in shards.values()), default=self.cursor)
+                horizon = min(self.cursor + window, max(self.cursor, self.highest_found + 1) + LOOKAHEAD)
+                if start >= horizon:
+                    return None
+                shard = {"start": start, "end": min(start + shard_size, horizon), "next": start}
+                key = self._free_key(start)
+                shards[key] = shard
+            self.claimed.add(key)
+            return shard
+
+    def _free_key(self, start):
+        key, n = str(start), 1
+        while key in self.data["shards"]:
+            key, n = f"{start}.{n}", n + 1
+        return key
+
+    def _add_recheck_shards(self):
+        """Misses that now sit below a known phone get one more probe, which settles them as found or gap."""
+        shards = self.data["shards"]
+        covered = lambda i: any(s["next"] <= i < s["end"] for s in shards.values())
+        stale = sorted(i for i in self.misses if i < self.highest_found and not covered(i))
+        run = []
+        for i in stale + [None]:
+            if run and (i is None or i != run[-1] + 1 or len(run) == SHARD_SIZE):
+                shards[self._free_key(run[0])] = {"start": run[0], "end": run[-1] + 1, "next": run[0]}
+                run = []
+            if i is not None:
+                run.append(i)
+
+    def record(self, shard, mobile_id, found, highest_before):
+        """Stores one probe result. highest_before is highest_found when the probe was sent."""
+        with self.lock:
+            block = self.data["blocks"].setdefault(str(mobile_id // BLOCK_SIZE), [0, 0])
+            block[0] += 1
+            if found:
+                block[1] += 1
+                self.found.add(mobile_id)
+                self.misses.discard(mobile_id)
+                self.data["highest_found"] = max(self.highest_found, mobile_id)
+                self.new_found += 1
+            elif mobile_id < highest_before:
+                self.gaps.add(mobile_id)
+                self.misses.discard(mobile_id)
+            else:
+                self.misses.add(mobile_id)
+            shard["next"] = mobile_id + 1
+            self._save()
+
+    def skip(self, shard):
+        with self.lock:
+            shard["next"] += 1
+
+    def resolve(self):
+        """Advances the cursor over resolved IDs and drops bookkeeping below it."""
+        with self.lock:
+            cursor = self.cursor
+            pending = [s["next"] for s in self.data["shards"].values() if s["next"] < s["end"]]
+            limit = min(pending, default=float("inf"))
+            while cursor < limit and self.is_known(cursor):
+                cursor += 1
+            self.data["cursor"] = cursor
+            self.found = {i for i in self.found if i >= cursor}
+            self.gaps = {i for i in self.gaps if i >= cursor}
+            self.misses = {i for i in self.misses if i >= cursor}
+            self.data["shards"] = {k: s for k, s in self.data["shards"].items() if s["next"] < s["end"]}
+            self._save()
+
+    def _save(self):
+        self.data["found"] = sorted(self.found)
+        self.data["gaps"] = sorted(self.gaps)
+        self.data["misses"] = sorted(self.misses)
+        write_json(self.path, self.data)
+
+def sweep(probe, start_id, state_file=STATE_FILE, workers=WORKERS, max_found=MAX_FOUND, log=print):
+    """Probes IDs from the saved cursor (or start_id on the first run) across concurrent shards.
+
+    probe(mobile_id) returns True if the ID exists and was saved, False if it does not exist,
+    or None on a transient error. None or an exception leaves the shard pending at that ID for
+    the next run; only True and False are recorded.
+    """
+    state = SweepState(state_file, start_id)
+    stop = threading.Event()
+    log(f"Sweeping from ID {state.cursor} with {workers} workers (newest known ID: {state.highest_found}).")
+
+    def run_shard(shard):
+        miss_run = 0
+        while shard["next"] < shard["end"] and not stop.is_set():
+            mobile_id = shard["next"]
+            if state.is_known(mobile_id):
+                state.skip(shard)
+                continue
+
+            highest_before = state.highest_found
+            try:
+                found = probe(mobile_id)
+            except Exception as e:
+                log(f"ID {mobile_id} raised {e!r}")
+                found = None
+            if found is None:
+                log(f"ID {mobile_id} failed, shard {shard['start']} will resume there next run.")
+                return
+            state.record(shard, mobile_id, found, highest_before)
+
+            if found:
+                log(f"Successfully scraped ID: {mobile_id}")
+                miss_run = 0
+                if state.new_found >= max_found:
+                    stop.set()
+            else:
+                miss_run += 1
+                # A long run of misses past the newest phone means we have reached the end for now
+                if miss_run >= MAX_MISS_RUN and mobile_id > state.highest_found:
+                    return
+
+    def worker():
+        while not stop.is_set():
+            shard = state.next_shard()
+            if shard is None:
+                return
+            run_shard(shard)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(metrics.bind(worker)) for _ in range(workers)]:
+            future.result()
+
+    state.resolve()
+    log(f"Sweep done: {state.new_found} new models, cursor at {state.cursor}, "
+        f"{len(state.data['shards'])} shards pending.")
+    return state
@@ -0,0 +1,8 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The scripts import each other as top-level modules, as they do when run from the root
+for path in (os.path.join(ROOT, "scrapers"), ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
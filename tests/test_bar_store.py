@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from bar_store import BarStore
+
+START = pd.Timestamp("2026-02-10 09:00")
+NOW = int(pd.Timestamp("2026-02-10 12:20").timestamp())  # The 12:15 bar is forming
+
+
+def frame(first, count, minutes=15):
+    """TvDatafeed-style bars from `first` (a bar index since START), every `minutes`."""
+    index = pd.date_range(START + pd.Timedelta(minutes=minutes * first), periods=count, freq=f"{minutes}min",
+                          name="datetime")
+    close = 2000 + np.arange(first, first + count, dtype=float)
+    return pd.DataFrame({"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 1.0},
+                        index=index)
+
+
+class Upstream:
+    """fetch(n_bars): the last n_bars of a series ending at bar `last`, recording each request."""
+
+    def __init__(self, last):
+        self.last = last
+        self.requests = []
+
+    def __call__(self, n_bars):
+        self.requests.append(n_bars)
+        if self.last is None:
+            return None
+        return frame(self.last - n_bars + 1, n_bars)
+
+
+def update(store, upstream, n_bars=5):
+    return store.update("OANDA", "XAUUSD", "15m", 15, upstream, n_bars=n_bars, now=NOW)
+
+
+def test_fetches_only_the_bars_since_the_last_run(tmp_path):
+    store = BarStore(str(tmp_path))
+    bars = update(store, Upstream(last=12))  # 12:00
+    assert len(bars) == 5
+    upstream = Upstream(last=13)  # 12:15
+    bars = update(store, upstream)
+    assert upstream.requests == [2]  # The 12:00 bar again, and 12:15
+    assert bars["close"][-1] == 2013
+
+
+def test_failed_fetch_returns_no_bars(tmp_path):
+    store = BarStore(str(tmp_path))
+    update(store, Upstream(last=13))
+    assert len(update(store, Upstream(last=None))) == 0
+
+
+def test_stale_bars_are_not_returned(tmp_path):
+    store = BarStore(str(tmp_path))
+    # Upstream stopped at 11:45, which closed 20 minutes before "now": more than one interval
+    assert len(update(store, Upstream(last=11))) == 0
+    # A bar that only closed within the last interval still counts as current
+    assert len(update(store, Upstream(last=12))) == 5
@@ -0,0 +1,44 @@
+import csv
+import glob
+import os
+
+import numpy as np
+import pytest
+
+import candles
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "fixtures", "candles", "*.csv")))
+
+
+def load(path):
+    """(bars, {pattern: expected values}) from a bench_candles.py reference CSV."""
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(line for line in f if not line.startswith("#")))
+    bars = tuple(np.array([float(row[c]) for row in rows]) for c in ("open", "high", "low", "close"))
+    expected = {name: np.array([int(row[column]) for row in rows]) for name, column in candles.COLUMNS.items()}
+    return bars, expected
+
+
+def test_fixtures_exist():
+    assert FIXTURES
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_detect_matches_reference(path):
+    bars, expected = load(path)
+    got = candles.detect(*bars)
+    for name, values in expected.items():
+        mismatched = np.flatnonzero(got[name] != values)
+        assert not mismatched.size, f"{name} differs at bars {mismatched[:10].tolist()}"
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_newest_bar_shortcuts_match_reference(path):
+    bars, expected = load(path)
+    engine = candles.PatternEngine()
+    for i in range(len(bars[0])):
+        step = engine.update(*(x[i] for x in bars))
+        if i >= candles.LOOKBACK:
+            want = {name: int(values[i]) for name, values in expected.items()}
+            assert step == want, f"PatternEngine at bar {i}"
+            assert candles.last_patterns(*(x[:i + 1] for x in bars)) == want, f"last_patterns at bar {i}"
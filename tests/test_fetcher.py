@@ -0,0 +1,158 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from fetcher import Fetcher
+from http_cache import HttpCache
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Routes:
+        /ok                 200
+        /flaky/<n>          503 with Retry-After: 0 for the first n hits, then 200
+        /limited            429 with Retry-After: 2 on the first hit, then 200
+        /down               500 every time
+        /slow/<ms>          200 after a delay, body "<ms>"
+        /etag               200 with ETag "v1", or 304 when the request carries it
+    """
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = hits = server.hits.get(self.path, 0) + 1
+            server.arrivals.append((time.monotonic(), self.path))
+        route, _, arg = self.path.strip("/").partition("/")
+
+        if route == "flaky" and hits <= int(arg):
+            self.reply(503, headers={"Retry-After": "0"})
+        elif route == "limited" and hits == 1:
+            self.reply(429, headers={"Retry-After": "2"})
+        elif route == "down":
+            self.reply(500)
+        elif route == "slow":
+            time.sleep(int(arg) / 1000)
+            self.reply(200, arg)
+        elif route == "etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.reply(304, headers={"ETag": '"v1"'})
+            else:
+                self.reply(200, "version one", headers={"ETag": '"v1"'})
+        else:
+            self.reply(200, "ok")
+
+    def reply(self, status, body="", headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def base(server):
+    with server.lock:
+        server.hits, server.arrivals = {}, []
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def fetcher(sleeps=None, **kwargs):
+    kwargs.setdefault("rate", 0)
+    return Fetcher(sleep=sleeps.append if sleeps is not None else time.sleep, **kwargs)
+
+
+def test_retries_5xx_using_retry_after(server, base):
+    sleeps = []
+    response = fetcher(sleeps).get(f"{base}/flaky/2")
+    assert response.status_code == 200
+    assert server.hits["/flaky/2"] == 3
+    assert sleeps == [0.0, 0.0]
+
+
+def test_429_waits_as_long_as_retry_after_says(base):
+    sleeps = []
+    f = fetcher(sleeps, backoff=5)
+    assert f.get(f"{base}/limited").status_code == 200
+    assert sleeps == [2.0]
+    assert [t["attempt"] for t in f.timings] == [0, 1]
+
+
+def test_backoff_doubles_and_the_last_error_response_is_returned(server, base):
+    sleeps = []
+    response = fetcher(sleeps, retries=3, backoff=0.5).get(f"{base}/down")
+    assert response.status_code == 500
+    assert server.hits["/down"] == 4
+    assert sleeps == [0.5, 1.0, 2.0]
+
+
+def test_connection_errors_back_off_then_raise():
+    closed = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    port = closed.server_address[1]
+    closed.server_close()
+    sleeps = []
+    with pytest.raises(requests.ConnectionError):
+        fetcher(sleeps, retries=2, backoff=0.1).get(f"http://127.0.0.1:{port}/ok", timeout=2)
+    assert sleeps == [0.1, 0.2]
+
+
+def test_map_yields_in_input_order(base):
+    delays = [80, 10, 50, 0, 30]
+    results = list(fetcher(max_workers=5).map([f"{base}/slow/{ms}" for ms in delays]))
+    assert [url for url, _, _ in results] == [f"{base}/slow/{ms}" for ms in delays]
+    assert [response.text for _, response, error in results if error is None] == [str(ms) for ms in delays]
+
+
+def test_map_reports_errors_in_place():
+    closed = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    port = closed.server_address[1]
+    closed.server_close()
+    [(url, response, error)] = fetcher(retries=0).map([f"http://127.0.0.1:{port}/ok"])
+    assert response is None and isinstance(error, requests.ConnectionError)
+
+
+def test_limiter_spaces_requests_to_one_host(server, base):
+    list(fetcher(rate=20, max_workers=4).map([f"{base}/ok"] * 6))
+    arrivals = sorted(t for t, path in server.arrivals)
+    assert len(arrivals) == 6
+    gaps = [b - a for a, b in zip(arrivals, arrivals[1:])]
+    assert min(gaps) > 0.04  # 1/20 s, less scheduling jitter
+
+
+def test_304_is_unchanged_only_after_commit(tmp_path, base):
+    cache = HttpCache(str(tmp_path / "cache.json"))
+    f = fetcher(cache=cache)
+    url = f"{base}/etag"
+
+    first = f.get(url)
+    assert first.status_code == 200 and not first.unchanged
+    # Not committed yet: the next request is not conditional, so the full page comes back
+    assert f.get(url).status_code == 200
+
+    f.commit(first)
+    cache.save()
+    reloaded = fetcher(cache=HttpCache(str(tmp_path / "cache.json")))
+    second = reloaded.get(url)
+    assert second.status_code == 304 and second.unchanged
+    # conditional=False always gets the body
+    full = reloaded.get(url, conditional=False)
+    assert full.status_code == 200 and full.text == "version one" and not full.unchanged
@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+# Importing a script must not do its work: no files in the working directory, no connections
+CHECK = """
+import importlib, socket, sys
+
+def refuse(*args, **kwargs):
+    raise AssertionError("connection opened at import time")
+socket.socket.connect = socket.socket.connect_ex = refuse
+socket.create_connection = refuse
+
+importlib.import_module(sys.argv[1])
+"""
+
+
+@pytest.mark.parametrize("module", ["100", "collect_data", "generate_sitemap", "batch_scraper",
+                                    "latest_scraper", "scheduler", "metrics"])
+def test_import_has_no_side_effects(module, tmp_path):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, "scrapers")]),
+               PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run([sys.executable, "-c", CHECK, module], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == ""
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,50 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from fetcher import Fetcher
+
+
+class Response:
+    def __init__(self, url):
+        self.url = url
+        self.status_code = 200
+        self.content = b"page"
+        self.headers = {}
+
+
+class Session:
+    headers = {}
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def get(self, url, **kwargs):
+        return Response(url)
+
+
+def test_helper_threads_record_only_through_bind():
+    report = metrics.start("run")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        pool.submit(metrics.count, "unbound").result()
+        pool.submit(metrics.bind(metrics.count), "bound").result()
+    assert report.counters == {"bound": 1}
+
+
+def test_concurrent_runs_keep_their_fetch_counts_apart():
+    """Like the scheduler's batch and latest jobs: two runs, each fanning out to fetch workers."""
+    reports, ready = {}, threading.Barrier(2)
+
+    def job(name, pages):
+        reports[name] = metrics.start(name)
+        ready.wait()  # Both reports exist before either fetches
+        fetcher = Fetcher(session=Session(), rate=0)
+        list(fetcher.map([f"https://example.com/{name}/{i}" for i in range(pages)]))
+
+    threads = [threading.Thread(target=job, args=("batch", 3)), threading.Thread(target=job, args=("latest", 5))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert reports["batch"].counters["requests"] == 3
+    assert reports["latest"].counters["requests"] == 5
@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from scheduler import Cron, FakeClock, Scheduler
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class InlineExecutor:
+    """Runs every submitted job at once, on the calling thread."""
+
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+class HeldExecutor:
+    """Keeps submitted jobs until release(), so a job can still be running when it comes due again."""
+
+    def __init__(self):
+        self.pending = []
+
+    def submit(self, fn, *args):
+        self.pending.append((fn, args))
+
+    def release(self):
+        while self.pending:
+            fn, args = self.pending.pop(0)
+            fn(*args)
+
+
+@pytest.fixture(autouse=True)
+def scratch_cwd(tmp_path, monkeypatch):
+    # Every run saves its metrics report under .build/metrics/
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.mark.parametrize("expression, after, expected", [
+    ("0,15,30,45 * * * *", utc(2026, 2, 10, 10, 7), utc(2026, 2, 10, 10, 15)),
+    ("0,15,30,45 * * * *", utc(2026, 2, 10, 10, 15), utc(2026, 2, 10, 10, 30)),  # Strictly after
+    ("0,15,30,45 * * * *", utc(2026, 2, 10, 10, 15, 30), utc(2026, 2, 10, 10, 30)),
+    ("15 18 * * *", utc(2026, 2, 10, 18, 15), utc(2026, 2, 11, 18, 15)),
+    ("0 0 * * *", utc(2026, 12, 31, 23, 59), utc(2027, 1, 1, 0, 0)),
+    ("*/20 9-10 * * *", utc(2026, 2, 10, 10, 41), utc(2026, 2, 11, 9, 0)),
+    ("0 0 1 3 *", utc(2026, 2, 10), utc(2026, 3, 1)),
+    ("0 12 * * 1", utc(2026, 2, 10), utc(2026, 2, 16, 12)),  # Monday
+    ("0 0 13 * 5", utc(2026, 2, 10), utc(2026, 2, 13)),      # Day of month or weekday: Friday
+    ("0 0 1 * 3", utc(2026, 2, 10), utc(2026, 2, 11)),       # ... a Wednesday comes first
+])
+def test_cron_next_after(expression, after, expected):
+    assert Cron(expression).next_after(after) == expected
+
+
+def test_cron_rejects_wrong_field_count():
+    with pytest.raises(ValueError):
+        Cron("0 * * *")
+
+
+def test_run_pending_skips_a_job_that_is_still_running():
+    clock, executor, log = FakeClock(utc(2026, 2, 10, 10, 0, 30)), HeldExecutor(), []
+    scheduler = Scheduler(clock=clock, executor=executor, log=log.append)
+    runs = []
+    job = scheduler.add("tick", "* * * * *", lambda: runs.append(clock.now()))
+
+    assert scheduler.run_pending() == []
+    clock.advance(60)
+    assert scheduler.run_pending() == ["tick"]
+    clock.advance(60)
+    assert scheduler.run_pending() == []  # The first run has not finished
+    assert job.skipped == 1 and job.next_run == utc(2026, 2, 10, 10, 3)
+
+    executor.release()
+    assert runs and job.runs == 1 and not job.running
+    clock.advance(60)
+    assert scheduler.run_pending() == ["tick"]
+
+
+def test_run_now_refuses_a_running_job():
+    scheduler = Scheduler(clock=FakeClock(utc(2026, 2, 10)), executor=HeldExecutor(), log=lambda line: None)
+    scheduler.add("tick", "* * * * *", lambda: None)
+    scheduler.clock.advance(60)
+    scheduler.run_pending()
+    assert scheduler.run_now("tick") is False
+
+
+def test_failures_are_counted_and_the_job_runs_again():
+    clock = FakeClock(utc(2026, 2, 10))
+    scheduler = Scheduler(clock=clock, executor=InlineExecutor(), log=lambda line: None)
+
+    def fail():
+        raise RuntimeError("boom")
+    job = scheduler.add("fail", "* * * * *", fail)
+    scheduler.run_forever(until=utc(2026, 2, 10, 0, 3))
+    assert job.failures == job.runs == 2 and not job.running  # 00:01 and 00:02; the deadline is exclusive
+
+
+def test_run_forever_replays_schedules_until_the_deadline():
+    clock = FakeClock(utc(2026, 2, 10, 0, 30))
+    scheduler = Scheduler(clock=clock, executor=InlineExecutor(), log=lambda line: None)
+    hourly, quarterly = [], []
+    scheduler.add("hourly", "0 * * * *", lambda: hourly.append(clock.now()))
+    scheduler.add("quarterly", "0,15,30,45 * * * *", lambda: quarterly.append(clock.now()))
+
+    scheduler.run_forever(until=utc(2026, 2, 10, 3, 30))
+
+    assert hourly == [utc(2026, 2, 10, h) for h in (1, 2, 3)]
+    assert quarterly == [utc(2026, 2, 10, h, m) for h in range(4) for m in (0, 15, 30, 45)][3:-2]
+    assert clock.now() >= utc(2026, 2, 10, 3, 30)
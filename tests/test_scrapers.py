@@ -0,0 +1,94 @@
+import shutil
+
+import batch_scraper
+import latest_scraper
+from fetcher import Fetcher
+from http_cache import HttpCache
+from spec_store import SpecStore
+
+PAGE = """<html><body>
+<div class="specs-photo-main"><a href="#"><img src="https://img.example/phone.jpg"></a></div>
+<h1 class="specs-phone-name-title">Test Phone</h1>
+<div id="specs-list"><table cellspacing="0">
+<tr><th rowspan="2" scope="row">Launch</th><td class="ttl"><a href="#">Announced</a></td><td class="nfo" data-spec="year">2026, February 10</td></tr>
+<tr><td class="ttl"><a href="#">Status</a></td><td class="nfo">Available</td></tr>
+</table></div></body></html>"""
+
+
+class Response:
+    def __init__(self, url, status, body=""):
+        self.url = url
+        self.status_code = status
+        self.text = body
+        self.content = body.encode("utf-8")
+        self.headers = {"ETag": '"v1"'} if status == 200 else {}
+
+
+class Session:
+    """Serves {url: html}; answers 304 to any request carrying the page's ETag."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.headers = {}
+        self.requests = []
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def get(self, url, headers=None, **kwargs):
+        conditional = (headers or {}).get("If-None-Match") == '"v1"'
+        self.requests.append((url, conditional))
+        if url not in self.pages:
+            return Response(url, 404)
+        return Response(url, 304) if conditional else Response(url, 200, self.pages[url])
+
+
+def cached_fetcher(session, tmp_path, urls):
+    """A Fetcher whose HTTP cache already holds every url, as after a run whose save was lost."""
+    cache = HttpCache(str(tmp_path / "cache.json"))
+    for url in urls:
+        cache.commit(url, Response(url, 200, session.pages[url]))
+    return Fetcher(session=session, rate=0, cache=cache)
+
+
+def test_batch_refetches_a_304_the_store_lacks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    url = f"{batch_scraper.BASE_URL}phone-recorder.php3?idPhone=123"
+    session = Session({url: PAGE})
+    fetcher, store = cached_fetcher(session, tmp_path, [url]), SpecStore()
+
+    assert batch_scraper.scrape_by_id(123, fetcher, store) is True
+    assert session.requests == [(url, True), (url, False)]
+    assert store.has(123, "data")
+
+    # Now saved: the next 304 is skipped without a second request
+    session.requests.clear()
+    assert batch_scraper.scrape_by_id(123, fetcher, store) is True
+    assert session.requests == [(url, True)]
+
+
+def test_latest_refetches_a_304_the_store_lacks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    base = "https://phones.example/"
+    device_url = base + "test_phone-456.php"
+    session = Session({base: '<a class="module-phones-link" href="test_phone-456.php">x</a>', device_url: PAGE})
+    fetcher, store = cached_fetcher(session, tmp_path, [device_url]), SpecStore()
+
+    latest_scraper.scrape_latest(fetcher=fetcher, base_url=base, store=store, targets=["2026, February"])
+    assert (device_url, False) in session.requests
+    assert store.has(456, "latest")
+    assert (tmp_path / "latest" / "test_phone-456" / "specs.json").exists()
+
+
+def test_store_rebuilds_uncommitted_blobs_from_the_folders(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = SpecStore()
+    store.put(7, "phone", {"Launch": {"Status": "Rumored"}}, "data/phone-7")
+    store.materialize()
+    store.save()
+    shutil.rmtree(tmp_path / "specstore" / "blobs")  # A fresh checkout: blobs/ is not committed
+
+    store = SpecStore()
+    entry = store.put(7, "phone", {"Launch": {"Status": "Available"}}, "data/phone-7")
+    assert entry["changes"] == [{"field": "Launch/Status", "old": "Rumored", "new": "Available"}]
+    assert store.materialize() == 1
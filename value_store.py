@@ -0,0 +1,128 @@
+"""Append-only storage for the XAUUSD history written by collect_data.py.
+
+Entries are appended as JSON Lines to numbered segments under STORE_DIR, so a tick writes one
+line instead of rewriting the whole history. index.json records, per segment, its entry count
+and timestamp range: a new timestamp later than everything stored is accepted without reading
+any segment, and only an out-of-order one scans the segment whose range covers it.
+Whole segments are dropped once the newer ones alone hold RETENTION entries.
+
+export() writes the last RETENTION entries as the classic data/value.json array and records
+when it did in STORE_DIR/exported_at, so export_due() can space exports out by their age
+rather than by the wall-clock minute.
+
+Usage:
+    python value_store.py               # Export data/value.json from the store
+    python value_store.py --import-json # One-off migration of an existing data/value.json
+"""
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+
+from json_files import read_json, write_json, write_text
+
+# --- CONFIGURATION ---
+STORE_DIR = "data/value"
+EXPORT_FILE = "data/value.json"
+RETENTION = 1000      # Entries kept, same window as the old value.json
+SEGMENT_SIZE = 250    # Entries per segment before rolling over to a new one
+EXPORT_STAMP = "exported_at"  # In the store directory; an ISO time, since checkouts reset mtimes
+
+class ValueStore:
+    def __init__(self, directory=STORE_DIR, retention=RETENTION, segment_size=SEGMENT_SIZE):
+        self.directory = directory
+        self.retention = retention
+        self.segment_size = segment_size
+        self.index_path = os.path.join(directory, "index.json")
+        self.stamp_path = os.path.join(directory, EXPORT_STAMP)
+        os.makedirs(directory, exist_ok=True)
+        self.segments = []  # [{"file", "count", "first", "last"}], oldest first
+        self.segments = read_json(self.index_path, {"segments": []})["segments"]
+
+    def __len__(self):
+        return sum(s["count"] for s in self.segments)
+
+    def contains(self, timestamp):
+        for segment in self.segments:
+            if segment["first"] <= timestamp <= segment["last"]:
+                if any(entry["timestamp"] == timestamp for entry in self._read(segment)):
+                    return True
+        return False
+
+    def append(self, entry):
+        """Appends entry unless its timestamp is already stored. Returns True if it was added."""
+        timestamp = entry["timestamp"]
+        latest = self.segments[-1]["last"] if self.segments else None
+        # Timestamps normally only grow, so the common case never touches a segment file
+        if latest is not None and timestamp <= latest and self.contains(timestamp):
+            return False
+
+        if not self.segments or self.segments[-1]["count"] >= self.segment_size:
+            number = int(self.segments[-1]["file"].split(".")[0]) + 1 if self.segments else 0
+            self.segments.append({"file": f"{number:06d}.jsonl", "count": 0, "first": timestamp, "last": timestamp})
+        segment = self.segments[-1]
+        with open(os.path.join(self.directory, segment["file"]), 'a') as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        segment["count"] += 1
+        segment["first"] = min(segment["first"], timestamp)
+        segment["last"] = max(segment["last"], timestamp)
+
+        self._apply_retention()
+        self._save_index()
+        return True
+
+    def entries(self):
+        """The retained entries in insertion order, oldest first."""
+        history = [entry for segment in self.segments for entry in self._read(segment)]
+        return history[-self.retention:]
+
+    def export(self, path=EXPORT_FILE):
+        """Writes the value.json view: a JSON array of the last RETENTION entries."""
+        history = self.entries()
+        write_json(path, history, indent=4)
+        write_text(self.stamp_path, datetime.now(timezone.utc).isoformat(timespec="seconds"))
+        return len(history)
+
+    def export_due(self, max_age):
+        """True if the last export() was more than max_age seconds ago, or never happened."""
+        if not os.path.exists(self.stamp_path):
+            return True
+        with open(self.stamp_path, 'r') as f:
+            try:
+                exported = datetime.fromisoformat(f.read().strip())
+            except ValueError:
+                return True
+        return (datetime.now(timezone.utc) - exported).total_seconds() > max_age
+
+    def import_json(self, path=EXPORT_FILE):
+        """Appends every entry of an existing value.json; already stored timestamps are skipped."""
+        if not os.path.exists(path):
+            return 0
+        with open(path, 'r') as f:
+            try:
+                history = json.load(f)
+            except json.JSONDecodeError:
+                return 0
+        return sum(1 for entry in history if "timestamp" in entry and self.append(entry))
+
+    def _read(self, segment):
+        with open(os.path.join(self.directory, segment["file"]), 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _apply_retention(self):
+        while len(self.segments) > 1 and len(self) - self.segments[0]["count"] >= self.retention:
+            os.remove(os.path.join(self.directory, self.segments.pop(0)["file"]))
+
+    def _save_index(self):
+        write_json(self.index_path, {"segments": self.segments})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the append-only XAUUSD history.")
+    parser.add_argument("--import-json", action="store_true",
+                        help=f"Migrate entries from {EXPORT_FILE} into {STORE_DIR} before exporting")
+    args = parser.parse_args()
+
+    store = ValueStore()
+    if args.import_json:
+        print(f"Imported {store.import_json()} entries from {EXPORT_FILE}")
+    print(f"Exported {store.export()} entries to {EXPORT_FILE}")